@@ -184,41 +184,22 @@ Log File: ${logFileName}
     setupRoutes() {
         // Health check endpoint
         this.app.get('/health', (req, res) => {
-            const sessionInfo = Array.from(this.sessions.entries()).map(([id, session]) => ({
-                id,
-                sessionNumber: session.logger.sessionNumber,
-                logFile: path.basename(session.logger.logFile),
-                currentPath: session.currentPath,
-                createdAt: session.createdAt,
-                lastActivity: session.lastActivity
-            }));
+            res.json(this.healthInfo());
+        });
 
+        // Health, stats and sessions in one response, for clients that
+        // refresh all three together
+        this.app.get('/status', (req, res) => {
             res.json({
-                status: 'ok',
-                timestamp: new Date().toISOString(),
-                redis: this.redisClient.isOpen ? 'connected' : 'disconnected',
-                rabbitmq: this.connection ? 'connected' : 'disconnected',
-                sessions: sessionInfo,
-                platform: os.platform(),
-                logsDirectory: this.logsDir,
-                totalSessions: this.sessionCounter - 1,
+                health: this.healthInfo(),
                 stats: this.commandStats,
-                redisHost: this.redisHost,
-                rabbitmqHost: this.rabbitmqHost
+                sessions: { sessions: this.sessionInfo() }
             });
         });
 
         // Session management endpoints
         this.app.get('/sessions', (req, res) => {
-            const sessionInfo = Array.from(this.sessions.entries()).map(([id, session]) => ({
-                id,
-                sessionNumber: session.logger.sessionNumber,
-                logFile: path.basename(session.logger.logFile),
-                currentPath: session.currentPath,
-                createdAt: session.createdAt,
-                lastActivity: session.lastActivity
-            }));
-            res.json({ sessions: sessionInfo });
+            res.json({ sessions: this.sessionInfo() });
         });
 
         // Get session log content
@@ -362,6 +343,7 @@ Log File: ${logFileName}
                 logsDirectory: this.logsDir,
                 endpoints: [
                     'GET  /health',
+                    'GET  /status',
                     'GET  /sessions',
                     'GET  /sessions/:sessionId/log',
                     'GET  /logs',
@@ -376,6 +358,33 @@ Log File: ${logFileName}
         });
     }
 
+    sessionInfo() {
+        return Array.from(this.sessions.entries()).map(([id, session]) => ({
+            id,
+            sessionNumber: session.logger.sessionNumber,
+            logFile: path.basename(session.logger.logFile),
+            currentPath: session.currentPath,
+            createdAt: session.createdAt,
+            lastActivity: session.lastActivity
+        }));
+    }
+
+    healthInfo() {
+        return {
+            status: 'ok',
+            timestamp: new Date().toISOString(),
+            redis: this.redisClient.isOpen ? 'connected' : 'disconnected',
+            rabbitmq: this.connection ? 'connected' : 'disconnected',
+            sessions: this.sessionInfo(),
+            platform: os.platform(),
+            logsDirectory: this.logsDir,
+            totalSessions: this.sessionCounter - 1,
+            stats: this.commandStats,
+            redisHost: this.redisHost,
+            rabbitmqHost: this.rabbitmqHost
+        };
+    }
+
     async setupRabbitMQ() {
         try {
             const rabbitmqUrl = `amqp://${this.rabbitmqHost}:${this.rabbitmqPort}`;
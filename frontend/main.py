@@ -1,38 +1,82 @@
-from PyQt5.QtWidgets import QApplication
-from PyQt5.QtGui import QFont
 import sys
 import logging
 import argparse
-import uuid
+import secrets
+import select
+import time
 import os
 
-from frontend.modules.greenhouse import GreenhouseDesktop, setup_logging
-from modules.command_worker import CommandWorker
+from modules.logging_setup import setup_logging
 
 def run_headless():
     # Headless behavior: connect CommandWorker and accept simple CLI input
     setup_logging()
     logger = logging.getLogger('GreenhouseDesktop')
     logger.info("Starting headless mode (no GUI)")
+    # Only the worker is needed here; the Qt widget stack never loads
+    from modules.command_worker import CommandWorker
     worker = CommandWorker()
     worker.setup_rabbitmq()
 
+    # One session for the whole run so the backend keeps state between commands
+    session_id = secrets.token_hex(16)
+
+    def make_payload(cmd):
+        # Send as developer execute_raw command
+        return {
+            "commandId": secrets.token_hex(16),
+            "command": "execute_raw",
+            "type": "developer",
+            "parameters": {"raw_command": cmd},
+            "sessionId": session_id,
+            "raw_command": cmd
+        }
+
+    # Interactive sessions send line by line; piped input is published in
+    # batches of up to batch_size lines (or whatever arrives within
+    # batch_timeout of the first one) and confirmed once per batch.
+    # stdin is read from the raw fd: select() can't see lines already
+    # sitting in sys.stdin's buffer
+    interactive = sys.stdin.isatty()
+    batch_size = 1 if interactive else 100
+    batch_timeout = 0.05
+    stdin_fd = sys.stdin.fileno()
+    buffered = b""
+    eof = False
+
     try:
         print("Headless mode. Type commands (or Ctrl+C to quit).")
-        while True:
-            cmd = input("> ").strip()
-            if not cmd:
-                continue
-            # Send as developer execute_raw command
-            payload = {
-                "commandId": str(uuid.uuid4()),
-                "command": "execute_raw",
-                "type": "developer",
-                "parameters": {"raw_command": cmd},
-                "sessionId": str(uuid.uuid4()),
-                "raw_command": cmd
-            }
-            worker.send_command(payload)
+        while not eof:
+            if interactive:
+                print("> ", end="", flush=True)
+            lines = []
+            deadline = None
+            while len(lines) < batch_size:
+                if b"\n" in buffered:
+                    line, buffered = buffered.split(b"\n", 1)
+                    lines.append(line)
+                    if deadline is None:
+                        deadline = time.monotonic() + batch_timeout
+                    continue
+                timeout = None if deadline is None else max(0, deadline - time.monotonic())
+                if not select.select([stdin_fd], [], [], timeout)[0]:
+                    break
+                chunk = os.read(stdin_fd, 65536)
+                if not chunk:
+                    eof = True
+                    if buffered:
+                        lines.append(buffered)
+                    break
+                buffered += chunk
+
+            commands = [cmd for cmd in (line.decode(errors='replace').strip() for line in lines) if cmd]
+            for cmd in commands:
+                worker.send_command(make_payload(cmd))
+            if commands and not worker.wait_for_confirms():
+                logger.warning("Broker did not confirm every command in the batch")
+
+        logger.info("Headless input closed")
+        worker.disconnect()
     except KeyboardInterrupt:
         logger.info("Headless exiting")
         try:
@@ -63,6 +107,7 @@ def run_gui(debug=False):
     font = QFont("Segoe UI", 10)
     app.setFont(font)
 
+    from modules.greenhouse import GreenhouseDesktop
     window = GreenhouseDesktop()
     window.show()
     sys.exit(app.exec_())
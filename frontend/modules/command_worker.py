@@ -1,13 +1,16 @@
 import pika
-import json
+import orjson
 import uuid
 import logging
 import time
 import os
-from PyQt5.QtCore import QObject, pyqtSignal, QTimer
+from PyQt5.QtCore import QObject, pyqtSignal, QTimer, QSocketNotifier
+
+from modules.pika_compat import enable_async_confirms, connection_socket
 
 class CommandWorker(QObject):
-    response_received = pyqtSignal(dict)
+    # object, not dict: a dict signature copies every response into a QVariantMap
+    response_received = pyqtSignal(object)
     connection_status = pyqtSignal(bool)
     error_occurred = pyqtSignal(str)
     
@@ -19,9 +22,13 @@ class CommandWorker(QObject):
         self.port = int(os.getenv('RABBITMQ_PORT', '5672'))
         self.username = os.getenv('RABBITMQ_USER', 'guest')
         self.password = os.getenv('RABBITMQ_PASS', 'guest')
+        # Consumer prefetch; lower it if handling a response can take long
+        # enough to hit the broker's delivery ack timeout
+        self.prefetch = int(os.getenv('RABBITMQ_PREFETCH', '100'))
         
         self.connection = None
-        self.channel = None
+        self.pub_channel = None  # confirm-mode channel for commands
+        self.sub_channel = None  # consumer channel for responses
         self.consuming = False
         self.logger = logging.getLogger('CommandWorker')
         self.pending_commands = {}
@@ -29,10 +36,32 @@ class CommandWorker(QObject):
         self.max_reconnect_attempts = 3
         self.consumer_tag = None
         
-        # Use QTimer for periodic checks instead of threads
+        # Deliveries are acked in batches with multiple=True
+        self.ack_batch_size = 50
+        self.last_ack_tag = None
+        self.unacked_count = 0
+        
+        # Publisher confirms arrive asynchronously; publish sequence number -> commandId
+        self.publish_seq = 0
+        self.unconfirmed = {}
+        
+        # pika's I/O runs on the GUI thread instead of a worker thread: a
+        # QSocketNotifier on the connection socket dispatches deliveries and
+        # confirms as soon as they arrive, and the timer only keeps
+        # heartbeats going and flushes acks when the socket is quiet
+        self.socket_notifier = None
         self.consumer_timer = QTimer()
-        self.consumer_timer.timeout.connect(self._check_for_messages)
-        self.consumer_timer.setInterval(100)  # Check every 100ms
+        self.consumer_timer.timeout.connect(self._process_data_events)
+        self.consumer_timer.setInterval(1000)
+        
+        # Dropped connections are re-established from the Qt event loop with
+        # exponential backoff rather than by sleeping on the GUI thread
+        self.initial_reconnect_delay = 0.25
+        self.max_reconnect_delay = 30.0
+        self.reconnect_delay = self.initial_reconnect_delay
+        self.reconnect_timer = QTimer()
+        self.reconnect_timer.setSingleShot(True)
+        self.reconnect_timer.timeout.connect(self.setup_rabbitmq)
         
         self.logger.info(f"Initializing CommandWorker for RabbitMQ at {self.host}:{self.port}")
         
@@ -50,71 +79,129 @@ class CommandWorker(QObject):
                 port=self.port,
                 credentials=credentials,
                 heartbeat=600,
-                blocked_connection_timeout=300
+                blocked_connection_timeout=300,
+                # pika already sets TCP_NODELAY on its sockets; add keepalive
+                # probes so dead peers are noticed well before the heartbeat
+                tcp_options={'TCP_KEEPIDLE': 60, 'TCP_KEEPINTVL': 10, 'TCP_KEEPCNT': 3}
             )
             
             self.connection = pika.BlockingConnection(parameters)
-            self.channel = self.connection.channel()
+            self.pub_channel = self.connection.channel()
+            self.sub_channel = self.connection.channel()
             
             # Declare queues (let server handle arguments)
-            self.channel.queue_declare(queue='greenhouse_commands', durable=True)
-            self.channel.queue_declare(queue='command_responses', durable=True)
+            self.pub_channel.queue_declare(queue='greenhouse_commands', durable=True)
+            self.sub_channel.queue_declare(queue='command_responses', durable=True)
             
-            # Set QoS
-            self.channel.basic_qos(prefetch_count=10)
+            # Enable publisher confirms without BlockingChannel's per-publish
+            # wait: confirms are collected by the event pump in batches
+            enable_async_confirms(self.pub_channel, self._on_publish_confirm)
+            self.publish_seq = 0
             
-            self.connection_status.emit(True)
-            self.logger.info("Successfully connected to RabbitMQ")
+            # Set QoS (must precede basic_consume to apply to the consumer)
+            self.sub_channel.basic_qos(prefetch_count=self.prefetch, global_qos=False)
             
-            # Start the message checker
+            # Register a long-lived consumer so responses are pushed to us
+            self.consumer_tag = self.sub_channel.basic_consume(
+                queue='command_responses',
+                on_message_callback=self._on_message,
+                auto_ack=False
+            )
+            
+            # Start pumping connection events
+            self.socket_notifier = QSocketNotifier(
+                connection_socket(self.connection).fileno(), QSocketNotifier.Read)
+            self.socket_notifier.activated.connect(lambda _fd: self._process_data_events())
             self.consumer_timer.start()
+            
+            self.connection_status.emit(True)
+            self.logger.info("Successfully connected to RabbitMQ")
             self.consuming = True
+            self.reconnect_attempts = 0
+            self.reconnect_delay = self.initial_reconnect_delay
+            
+            # Re-send anything the previous connection never confirmed
+            self._republish_unconfirmed()
             
             return True
             
         except Exception as e:
             self.logger.error(f"Failed to connect to RabbitMQ at {self.host}:{self.port}: {str(e)}")
             self.connection_status.emit(False)
+            self._schedule_reconnect()
             return False
     
-    def _check_for_messages(self):
-        """Check for incoming messages (non-blocking)"""
-        if not self.connection or not self.channel:
+    def _schedule_reconnect(self):
+        """Retry the connection later without blocking the event loop"""
+        if self.reconnect_timer.isActive():
+            return
+        
+        self.logger.info(f"Reconnecting to RabbitMQ in {self.reconnect_delay:.2f} seconds")
+        self.reconnect_timer.start(int(self.reconnect_delay * 1000))
+        self.reconnect_delay = min(self.reconnect_delay * 2, self.max_reconnect_delay)
+    
+    def _process_data_events(self):
+        """Dispatch deliveries already pushed by the broker (non-blocking)"""
+        if not self.connection or not self.sub_channel:
             return
             
         try:
-            # Non-blocking check for messages
-            method_frame, header_frame, body = self.channel.basic_get(
-                queue='command_responses', 
-                auto_ack=False
-            )
-            
-            if method_frame:
-                # We got a message!
-                try:
-                    response = json.loads(body.decode())
-                    command_id = response.get('commandId', 'unknown')
-                    self.logger.info(f"Received response for command: {command_id}")
-                    
-                    # Acknowledge the message
-                    self.channel.basic_ack(method_frame.delivery_tag)
-                    
-                    # Emit the response
-                    self.response_received.emit(response)
-                    
-                except json.JSONDecodeError as e:
-                    self.logger.error(f"Failed to parse JSON response: {str(e)}")
-                    self.channel.basic_nack(method_frame.delivery_tag, requeue=False)
-                except Exception as e:
-                    self.logger.error(f"Error processing response: {str(e)}")
-                    self.channel.basic_nack(method_frame.delivery_tag, requeue=False)
-                    
+            self.connection.process_data_events(time_limit=0)
+            # Ack whatever this pump delivered in a single frame
+            self._flush_acks()
         except Exception as e:
-            self.logger.error(f"Error checking for messages: {str(e)}")
+            self.logger.error(f"Error processing RabbitMQ events: {str(e)}")
             # If we get an error, try to reconnect
             self.connection_status.emit(False)
             self.consuming = False
-            self.consumer_timer.stop()
+            self._stop_pumping()
+            self._schedule_reconnect()
+    
+    def _stop_pumping(self):
+        """Stop dispatching connection events until the next connect"""
+        self.consumer_timer.stop()
+        if self.socket_notifier is not None:
+            self.socket_notifier.setEnabled(False)
+            self.socket_notifier.deleteLater()
+            self.socket_notifier = None
+    
+    def _on_message(self, channel, method_frame, header_frame, body):
+        """Handle a response delivered to our consumer"""
+        try:
+            response = orjson.loads(body)
+            command_id = response.get('commandId', 'unknown')
+            self.logger.info("Received response for command: %s", command_id)
+            
+            # Emit the response
+            self.response_received.emit(response)
+            
+            # Acknowledge the message (batched)
+            self.last_ack_tag = method_frame.delivery_tag
+            self.unacked_count += 1
+            if self.unacked_count >= self.ack_batch_size:
+                self._flush_acks()
+            
+        except orjson.JSONDecodeError as e:
+            self.logger.error(f"Failed to parse JSON response: {str(e)}")
+            self._nack(method_frame.delivery_tag)
+        except Exception as e:
+            self.logger.error(f"Error processing response: {str(e)}")
+            self._nack(method_frame.delivery_tag)
+    
+    def _flush_acks(self):
+        """Acknowledge every delivery up to the last handled tag in one frame"""
+        if self.last_ack_tag is None:
+            return
+        
+        self.sub_channel.basic_ack(self.last_ack_tag, multiple=True)
+        self.last_ack_tag = None
+        self.unacked_count = 0
+    
+    def _nack(self, delivery_tag):
+        """Reject a single delivery without touching the pending ack batch"""
+        # Flush first so earlier good deliveries aren't swept into the nack
+        self._flush_acks()
+        self.sub_channel.basic_nack(delivery_tag, requeue=False)
     
     def send_command(self, command_data):
         try:
@@ -125,19 +212,11 @@ class CommandWorker(QObject):
                     return False
             
             # Send the command
-            self.channel.basic_publish(
-                exchange='',
-                routing_key='greenhouse_commands',
-                body=json.dumps(command_data),
-                properties=pika.BasicProperties(
-                    delivery_mode=2,  # persistent
-                    content_type='application/json'
-                )
-            )
-            
             command_id = command_data.get('commandId', 'unknown')
             self.pending_commands[command_id] = command_data
-            self.logger.info(f"Command {command_id} sent successfully: {command_data.get('command', 'unknown')}")
+            self._publish(command_id, command_data)
+            
+            self.logger.info("Command %s sent successfully: %s", command_id, command_data.get('command', 'unknown'))
             return True
             
         except pika.exceptions.ConnectionClosed:
@@ -149,30 +228,87 @@ class CommandWorker(QObject):
             self.connection_status.emit(False)
             return False
     
+    def _publish(self, command_id, command_data):
+        """Publish a command and track it until the broker confirms it"""
+        self.pub_channel.basic_publish(
+            exchange='',
+            routing_key='greenhouse_commands',
+            body=orjson.dumps(command_data),
+            properties=pika.BasicProperties(
+                delivery_mode=2,  # persistent
+                content_type='application/json'
+            )
+        )
+        self.publish_seq += 1
+        self.unconfirmed[self.publish_seq] = command_id
+    
+    def _on_publish_confirm(self, method_frame):
+        """Handle a (possibly multiple) Basic.Ack/Basic.Nack from the broker"""
+        confirm = method_frame.method
+        if confirm.multiple:
+            tags = [tag for tag in self.unconfirmed if tag <= confirm.delivery_tag]
+        else:
+            tags = [confirm.delivery_tag] if confirm.delivery_tag in self.unconfirmed else []
+        
+        nacked = isinstance(confirm, pika.spec.Basic.Nack)
+        for tag in tags:
+            command_id = self.unconfirmed.pop(tag)
+            if nacked and command_id in self.pending_commands:
+                self.logger.warning(f"Command {command_id} was nacked by the broker, re-publishing")
+                self._publish(command_id, self.pending_commands[command_id])
+    
+    def wait_for_confirms(self, timeout=5.0):
+        """Pump events until every published command is confirmed or timeout expires"""
+        deadline = time.monotonic() + timeout
+        while self.unconfirmed and self.connection and self.connection.is_open:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            self.connection.process_data_events(time_limit=min(remaining, 0.05))
+        self._flush_acks()
+        return not self.unconfirmed
+
+    def _republish_unconfirmed(self):
+        """Re-publish commands left unconfirmed by a dropped connection"""
+        outstanding = list(self.unconfirmed.values())
+        self.unconfirmed.clear()
+        for command_id in outstanding:
+            if command_id in self.pending_commands:
+                self.logger.info(f"Re-publishing unconfirmed command {command_id}")
+                self._publish(command_id, self.pending_commands[command_id])
+    
     def attempt_reconnect(self):
-        """Attempt to reconnect"""
+        """Attempt to reconnect immediately; later retries are scheduled by the timer"""
         if self.reconnect_attempts >= self.max_reconnect_attempts:
             self.logger.error("Max reconnection attempts reached")
             return False
             
-        delay = 2  # Short delay for quick retry
-        self.logger.info(f"Attempting reconnect in {delay} seconds (attempt {self.reconnect_attempts + 1})")
-        time.sleep(delay)
-        
+        self.logger.info(f"Attempting reconnect (attempt {self.reconnect_attempts + 1})")
         self.reconnect_attempts += 1
-        success = self.setup_rabbitmq()
-        if success:
-            self.reconnect_attempts = 0
-        return success
+        return self.setup_rabbitmq()
     
     def disconnect(self):
         self.logger.info("Disconnecting from RabbitMQ...")
         self.consuming = False
-        self.consumer_timer.stop()
+        self._stop_pumping()
+        self.reconnect_timer.stop()
+        
+        try:
+            if self.sub_channel and self.sub_channel.is_open:
+                self._flush_acks()
+                if self.consumer_tag:
+                    self.sub_channel.basic_cancel(self.consumer_tag)
+                self.sub_channel.close()
+        except Exception as e:
+            self.logger.error(f"Error closing channel: {str(e)}")
+        finally:
+            self.consumer_tag = None
+            self.last_ack_tag = None
+            self.unacked_count = 0
         
         try:
-            if self.channel and self.channel.is_open:
-                self.channel.close()
+            if self.pub_channel and self.pub_channel.is_open:
+                self.pub_channel.close()
         except Exception as e:
             self.logger.error(f"Error closing channel: {str(e)}")
         
@@ -0,0 +1,5 @@
+import sys
+
+# Slotted dataclasses need Python 3.10+; fall back to regular ones on older
+# interpreters (the frontend image still ships 3.9)
+DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
@@ -1,15 +1,19 @@
 import json
-import uuid
+import secrets
 import logging
 import math
-import random
+import itertools
+from collections import deque
 from datetime import datetime, timedelta
-from dataclasses import dataclass, asdict
-from typing import Dict, List, Optional, Any
+from dataclasses import dataclass
+from typing import Deque, Dict, List, Mapping, Optional, Any, Tuple
 from enum import Enum
-import threading
+from types import MappingProxyType
 import time
-from PyQt5.QtCore import QObject, pyqtSignal, QTimer
+from PyQt5.QtCore import (QObject, QThread, Qt, pyqtSignal, pyqtSlot, QTimer,
+                          QReadWriteLock, QReadLocker, QWriteLocker)
+
+from modules.compat import DATACLASS_SLOTS
 
 class SensorType(Enum):
     TEMPERATURE = "temperature"
@@ -26,7 +30,7 @@ class DataQuality(Enum):
     POOR = 0.4
     UNRELIABLE = 0.2
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class SensorReading:
     device_id: str
     sensor_type: SensorType
@@ -38,12 +42,18 @@ class SensorReading:
     signal_strength: Optional[float] = None
 
     def to_dict(self):
-        data = asdict(self)
-        data['timestamp'] = self.timestamp.isoformat()
-        data['sensor_type'] = self.sensor_type.value
-        return data
+        return {
+            'device_id': self.device_id,
+            'sensor_type': self.sensor_type.value,
+            'value': self.value,
+            'timestamp': self.timestamp.isoformat(),
+            'location': self.location,
+            'quality': self.quality,
+            'battery_level': self.battery_level,
+            'signal_strength': self.signal_strength
+        }
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class AggregatedData:
     timeframe: str
     sensor_type: SensorType
@@ -57,12 +67,20 @@ class AggregatedData:
     location: str
 
     def to_dict(self):
-        data = asdict(self)
-        data['timestamp'] = self.timestamp.isoformat()
-        data['sensor_type'] = self.sensor_type.value
-        return data
+        return {
+            'timeframe': self.timeframe,
+            'sensor_type': self.sensor_type.value,
+            'average': self.average,
+            'min': self.min,
+            'max': self.max,
+            'count': self.count,
+            'std_dev': self.std_dev,
+            'timestamp': self.timestamp.isoformat(),
+            'quality_score': self.quality_score,
+            'location': self.location
+        }
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class Anomaly:
     anomaly_id: str
     sensor_type: SensorType
@@ -75,13 +93,82 @@ class Anomaly:
     expected_range: tuple
 
     def to_dict(self):
-        data = asdict(self)
-        data['timestamp'] = self.timestamp.isoformat()
-        data['sensor_type'] = self.sensor_type.value
-        return data
+        return {
+            'anomaly_id': self.anomaly_id,
+            'sensor_type': self.sensor_type.value,
+            'location': self.location,
+            'anomaly_type': self.anomaly_type,
+            'severity': self.severity,
+            'message': self.message,
+            'timestamp': self.timestamp.isoformat(),
+            'value': self.value,
+            'expected_range': self.expected_range
+        }
+
+class WindowStats:
+    """Running statistics of one sensor stream over a sliding time window
+    
+    Sums are updated as readings enter and leave the window, and min/max are
+    tracked with monotonic deques, so aggregating is O(readings changed).
+    Timestamps are epoch seconds (floats) to keep the arithmetic cheap.
+    Entries are (timestamp, value, quality) tuples; the same tuple object is
+    shared by every window of a stream and by the min/max deques.
+    """
+    
+    def __init__(self, window_seconds: int):
+        self.window_seconds = window_seconds
+        self.readings: Deque[Tuple[float, float, float]] = deque()
+        self.min_candidates: Deque[Tuple[float, float, float]] = deque()
+        self.max_candidates: Deque[Tuple[float, float, float]] = deque()
+        self.count = 0
+        self.sum_v = 0.0
+        self.sum_v2 = 0.0
+        self.sum_q = 0.0
+        self.sum_vq = 0.0
+    
+    def add(self, entry: Tuple[float, float, float]):
+        _, value, quality = entry
+        self.readings.append(entry)
+        self.count += 1
+        self.sum_v += value
+        self.sum_v2 += value * value
+        self.sum_q += quality
+        self.sum_vq += value * quality
+        
+        while self.min_candidates and self.min_candidates[-1][1] >= value:
+            self.min_candidates.pop()
+        self.min_candidates.append(entry)
+        while self.max_candidates and self.max_candidates[-1][1] <= value:
+            self.max_candidates.pop()
+        self.max_candidates.append(entry)
+    
+    def evict(self, now: float):
+        """Drop readings that have fallen out of the window"""
+        cutoff = now - self.window_seconds
+        while self.readings and self.readings[0][0] < cutoff:
+            _, value, quality = self.readings.popleft()
+            self.count -= 1
+            self.sum_v -= value
+            self.sum_v2 -= value * value
+            self.sum_q -= quality
+            self.sum_vq -= value * quality
+        
+        while self.min_candidates and self.min_candidates[0][0] < cutoff:
+            self.min_candidates.popleft()
+        while self.max_candidates and self.max_candidates[0][0] < cutoff:
+            self.max_candidates.popleft()
+        
+        if not self.readings:
+            # Reset so float error from add/subtract cannot accumulate
+            self.count = 0
+            self.sum_v = self.sum_v2 = self.sum_q = self.sum_vq = 0.0
 
 class EdgeToFogAggregator(QObject):
-    """Handles data aggregation from edge devices to fog node"""
+    """Handles data aggregation from edge devices to fog node
+    
+    The aggregator lives on its own QThread so periodic aggregation and
+    cleanup never block the GUI; its signals reach GUI slots queued.
+    """
     
     # Signals for UI updates
     new_aggregated_data = pyqtSignal(dict)
@@ -90,11 +177,18 @@ class EdgeToFogAggregator(QObject):
     
     def __init__(self):
         super().__init__()
-        self.raw_data_buffer: Dict[str, List[SensorReading]] = {}
-        self.aggregated_data: Dict[str, List[AggregatedData]] = {}
+        # Keyed by (sensor_type, location) and (sensor_type, location, window)
+        self.window_stats: Dict[Tuple[SensorType, str], Dict[str, WindowStats]] = {}
+        self.aggregated_data: Dict[Tuple[SensorType, str, str], List[AggregatedData]] = {}
         self.edge_devices: Dict[str, Dict] = {}
-        self.anomalies: List[Anomaly] = []
-        self.aggregation_lock = threading.Lock()
+        # get_device_status() snapshot; reset to None whenever a device changes
+        self.device_status_cache: Optional[Tuple[Mapping[str, Any], ...]] = None
+        # Appended in time order; only the latest 100 are kept
+        self.anomalies: Deque[Anomaly] = deque(maxlen=100)
+        self.anomaly_total = 0  # anomalies ever recorded, for incremental readers
+        # Readers (device status, anomalies) share the lock; anything that
+        # mutates state, including window eviction, takes it for writing
+        self.aggregation_lock = QReadWriteLock()
         
         # Aggregation windows in seconds
         self.aggregation_windows = {
@@ -113,6 +207,11 @@ class EdgeToFogAggregator(QObject):
             SensorType.CO2_LEVEL: (300.0, 1500.0),     # PPM
             SensorType.SOIL_PH: (5.5, 7.5)             # pH
         }
+        # (min, max, midpoint) per sensor type for the per-reading range check
+        self.range_bounds = {
+            sensor_type: (low, high, (low + high) / 2)
+            for sensor_type, (low, high) in self.expected_ranges.items()
+        }
         
         # Anomaly detection thresholds
         self.anomaly_thresholds = {
@@ -122,22 +221,45 @@ class EdgeToFogAggregator(QObject):
         }
         
         self.logger = logging.getLogger('EdgeFogAggregator')
+        
+        # Move to a worker thread; timers are parented to self so they follow
+        self.worker_thread = QThread()
         self.setup_aggregation_timers()
+        self.moveToThread(self.worker_thread)
+        self.worker_thread.started.connect(self.start_aggregation_timers)
+        self.worker_thread.finished.connect(self.stop_aggregation_timers, Qt.DirectConnection)
+        self.worker_thread.start()
     
     def setup_aggregation_timers(self):
         """Setup timers for periodic aggregation"""
-        self.aggregation_timer = QTimer()
+        self.aggregation_timer = QTimer(self)
         self.aggregation_timer.timeout.connect(self.run_periodic_aggregation)
-        self.aggregation_timer.start(60000)  # Run every minute
+        self.aggregation_timer.setInterval(60000)  # Run every minute
         
-        self.cleanup_timer = QTimer()
+        self.cleanup_timer = QTimer(self)
         self.cleanup_timer.timeout.connect(self.cleanup_old_data)
-        self.cleanup_timer.start(300000)  # Cleanup every 5 minutes
+        self.cleanup_timer.setInterval(300000)  # Cleanup every 5 minutes
+    
+    @pyqtSlot()
+    def start_aggregation_timers(self):
+        """Start the timers from inside the worker thread"""
+        self.aggregation_timer.start()
+        self.cleanup_timer.start()
+    
+    @pyqtSlot()
+    def stop_aggregation_timers(self):
+        self.aggregation_timer.stop()
+        self.cleanup_timer.stop()
+    
+    def shutdown(self):
+        """Stop the worker thread (call from the GUI thread on exit)"""
+        self.worker_thread.quit()
+        self.worker_thread.wait()
     
     def register_edge_device(self, device_id: str, device_type: str, location: str, 
                            capabilities: List[SensorType], ip_address: str = None):
         """Register a new edge device"""
-        with self.aggregation_lock:
+        with QWriteLocker(self.aggregation_lock):
             self.edge_devices[device_id] = {
                 'type': device_type,
                 'location': location,
@@ -148,6 +270,7 @@ class EdgeToFogAggregator(QObject):
                 'battery_level': 100.0,
                 'registered_at': datetime.now()
             }
+            self.device_status_cache = None
             
             device_info = {
                 'device_id': device_id,
@@ -161,76 +284,105 @@ class EdgeToFogAggregator(QObject):
     
     def update_device_status(self, device_id: str, status: str, battery_level: float = None):
         """Update device status and battery level"""
-        if device_id in self.edge_devices:
-            self.edge_devices[device_id]['last_seen'] = datetime.now()
-            self.edge_devices[device_id]['status'] = status
-            
-            if battery_level is not None:
-                self.edge_devices[device_id]['battery_level'] = battery_level
-            
-            status_info = {
-                'device_id': device_id,
-                'status': status,
-                'battery_level': battery_level,
-                'last_seen': datetime.now().isoformat()
-            }
-            
-            self.device_status_changed.emit(status_info)
+        with QWriteLocker(self.aggregation_lock):
+            self.record_device_status(device_id, status, battery_level)
+    
+    def record_device_status(self, device_id: str, status: str, battery_level: float = None):
+        """Update one device and drop the cached status list (caller holds the write lock)"""
+        if device_id not in self.edge_devices:
+            return
+        self.edge_devices[device_id]['last_seen'] = datetime.now()
+        self.edge_devices[device_id]['status'] = status
+        
+        if battery_level is not None:
+            self.edge_devices[device_id]['battery_level'] = battery_level
+        self.device_status_cache = None
+        
+        status_info = {
+            'device_id': device_id,
+            'status': status,
+            'battery_level': battery_level,
+            'last_seen': datetime.now().isoformat()
+        }
+        
+        self.device_status_changed.emit(status_info)
     
     def add_sensor_reading(self, reading: SensorReading):
         """Add raw sensor data to aggregation buffer"""
-        with self.aggregation_lock:
-            key = f"{reading.sensor_type.value}_{reading.location}"
-            
-            if key not in self.raw_data_buffer:
-                self.raw_data_buffer[key] = []
-            
-            self.raw_data_buffer[key].append(reading)
-            
-            # Update device status
-            self.update_device_status(reading.device_id, 'online', reading.battery_level)
-            
-            # Check for immediate anomalies
-            self.check_immediate_anomalies(reading)
-            
-            self.logger.debug(f"Added reading: {reading.sensor_type.value} at {reading.location}: {reading.value}")
+        with QWriteLocker(self.aggregation_lock):
+            self.record_reading(reading)
+    
+    def add_sensor_readings(self, readings: List[SensorReading]):
+        """Add a batch of readings under a single lock acquisition"""
+        with QWriteLocker(self.aggregation_lock):
+            for reading in readings:
+                self.record_reading(reading)
+    
+    def record_reading(self, reading: SensorReading):
+        """Fold one reading into its window stats (caller holds the write lock)"""
+        key = (reading.sensor_type, reading.location)
+        
+        if key not in self.window_stats:
+            self.window_stats[key] = {
+                window: WindowStats(seconds)
+                for window, seconds in self.aggregation_windows.items()
+            }
+        
+        entry = (reading.timestamp.timestamp(), reading.value, reading.quality)
+        for stats in self.window_stats[key].values():
+            stats.add(entry)
+        
+        # Update device status
+        self.record_device_status(reading.device_id, 'online', reading.battery_level)
+        
+        # Check for immediate anomalies
+        self.check_immediate_anomalies(reading)
+        
+        self.logger.debug("Added reading: %s at %s: %s", reading.sensor_type.value, reading.location, reading.value)
     
     def check_immediate_anomalies(self, reading: SensorReading):
         """Check for immediate anomalies in new readings"""
-        if reading.sensor_type in self.expected_ranges:
-            min_expected, max_expected = self.expected_ranges[reading.sensor_type]
-            
-            if reading.value < min_expected or reading.value > max_expected:
-                anomaly = Anomaly(
-                    anomaly_id=str(uuid.uuid4()),
-                    sensor_type=reading.sensor_type,
-                    location=reading.location,
-                    anomaly_type="out_of_range",
-                    severity="critical" if abs(reading.value - (min_expected + max_expected)/2) > 10 else "warning",
-                    message=f"{reading.sensor_type.value} out of range: {reading.value:.1f} (expected {min_expected}-{max_expected})",
-                    timestamp=datetime.now(),
-                    value=reading.value,
-                    expected_range=(min_expected, max_expected)
-                )
-                
-                self.anomalies.append(anomaly)
-                self.anomaly_detected.emit(anomaly.to_dict())
-                self.logger.warning(f"Anomaly detected: {anomaly.message}")
+        bounds = self.range_bounds.get(reading.sensor_type)
+        if bounds is None:
+            return
+        
+        min_expected, max_expected, midpoint = bounds
+        value = reading.value
+        if min_expected <= value <= max_expected:
+            return
+        
+        anomaly = Anomaly(
+            anomaly_id=secrets.token_hex(16),
+            sensor_type=reading.sensor_type,
+            location=reading.location,
+            anomaly_type="out_of_range",
+            severity="critical" if abs(value - midpoint) > 10 else "warning",
+            message=f"{reading.sensor_type.value} out of range: {value:.1f} (expected {min_expected}-{max_expected})",
+            timestamp=datetime.now(),
+            value=value,
+            expected_range=(min_expected, max_expected)
+        )
+        
+        self.record_anomaly(anomaly)
+        self.logger.warning(f"Anomaly detected: {anomaly.message}")
     
+    def record_anomaly(self, anomaly: Anomaly):
+        """Store an anomaly and notify listeners (caller holds the write lock)"""
+        self.anomalies.append(anomaly)
+        self.anomaly_total += 1
+        self.anomaly_detected.emit(anomaly.to_dict())
+    
+    @pyqtSlot()
     def run_periodic_aggregation(self):
         """Run aggregation for all sensor types and locations"""
-        with self.aggregation_lock:
-            for key in list(self.raw_data_buffer.keys()):
-                # Extract sensor type and location from key
-                sensor_type_str, location = key.split('_', 1)
-                sensor_type = SensorType(sensor_type_str)
-                
+        with QWriteLocker(self.aggregation_lock):
+            for sensor_type, location in list(self.window_stats.keys()):
                 for window_name, window_seconds in self.aggregation_windows.items():
                     aggregated = self.aggregate_data(sensor_type, location, window_name)
                     
                     if aggregated:
                         # Store aggregated data
-                        agg_key = f"{sensor_type.value}_{location}_{window_name}"
+                        agg_key = (sensor_type, location, window_name)
                         if agg_key not in self.aggregated_data:
                             self.aggregated_data[agg_key] = []
                         
@@ -244,44 +396,41 @@ class EdgeToFogAggregator(QObject):
     
     def aggregate_data(self, sensor_type: SensorType, location: str, window: str) -> Optional[AggregatedData]:
         """Aggregate data for specific sensor type and time window"""
-        key = f"{sensor_type.value}_{location}"
-        if key not in self.raw_data_buffer:
+        windows = self.window_stats.get((sensor_type, location))
+        if not windows:
             return None
         
-        readings = self.raw_data_buffer[key]
-        window_seconds = self.aggregation_windows[window]
+        stats = windows[window]
+        now = time.time()
+        stats.evict(now)
         
-        # Filter readings within time window
-        current_time = datetime.now()
-        recent_readings = [
-            r for r in readings 
-            if (current_time - r.timestamp).total_seconds() <= window_seconds
-        ]
-        
-        if not recent_readings:
+        count = stats.count
+        if count == 0:
             return None
         
-        values = [r.value for r in recent_readings]
-        quality_scores = [r.quality for r in recent_readings]
-        
         # Calculate quality-weighted average
-        total_quality = sum(quality_scores)
-        if total_quality > 0:
-            weighted_values = [v * q for v, q in zip(values, quality_scores)]
-            average = sum(weighted_values) / total_quality
+        if stats.sum_q > 0:
+            average = stats.sum_vq / stats.sum_q
         else:
-            average = sum(values) / len(values)
+            average = stats.sum_v / count
+        
+        # Sample variance straight from the running sums,
+        # (sum(v^2) - sum(v)^2 / n) / (n - 1); no readings are revisited
+        if count > 1:
+            variance = max(stats.sum_v2 - stats.sum_v * stats.sum_v / count, 0.0) / (count - 1)
+        else:
+            variance = 0.0
         
         return AggregatedData(
             timeframe=window,
             sensor_type=sensor_type,
             average=average,
-            min=min(values),
-            max=max(values),
-            count=len(values),
-            std_dev=self._calculate_std_dev(values),
-            timestamp=current_time,
-            quality_score=sum(quality_scores) / len(quality_scores),
+            min=stats.min_candidates[0][1],
+            max=stats.max_candidates[0][1],
+            count=count,
+            std_dev=math.sqrt(variance),
+            timestamp=datetime.fromtimestamp(now),
+            quality_score=stats.sum_q / count,
             location=location
         )
     
@@ -310,7 +459,7 @@ class EdgeToFogAggregator(QObject):
         # Create anomaly objects
         for anomaly_info in anomalies:
             anomaly = Anomaly(
-                anomaly_id=str(uuid.uuid4()),
+                anomaly_id=secrets.token_hex(16),
                 sensor_type=aggregated.sensor_type,
                 location=aggregated.location,
                 anomaly_type=anomaly_info['type'],
@@ -321,12 +470,11 @@ class EdgeToFogAggregator(QObject):
                 expected_range=self.expected_ranges.get(aggregated.sensor_type, (0, 100))
             )
             
-            self.anomalies.append(anomaly)
-            self.anomaly_detected.emit(anomaly.to_dict())
+            self.record_anomaly(anomaly)
     
     def detect_rate_of_change_anomaly(self, current_agg: AggregatedData) -> Optional[Dict]:
         """Detect anomalies based on rate of change"""
-        key = f"{current_agg.sensor_type.value}_{current_agg.location}_{current_agg.timeframe}"
+        key = (current_agg.sensor_type, current_agg.location, current_agg.timeframe)
         
         if key in self.aggregated_data and len(self.aggregated_data[key]) >= 2:
             previous_data = self.aggregated_data[key][-2]
@@ -346,7 +494,7 @@ class EdgeToFogAggregator(QObject):
     
     def detect_trend_anomaly(self, current_agg: AggregatedData) -> Optional[Dict]:
         """Detect anomalies based on trend analysis"""
-        key = f"{current_agg.sensor_type.value}_{current_agg.location}_{current_agg.timeframe}"
+        key = (current_agg.sensor_type, current_agg.location, current_agg.timeframe)
         
         if key in self.aggregated_data and len(self.aggregated_data[key]) >= 5:
             recent_data = self.aggregated_data[key][-5:]
@@ -365,17 +513,9 @@ class EdgeToFogAggregator(QObject):
         
         return None
     
-    def _calculate_std_dev(self, values: List[float]) -> float:
-        """Calculate standard deviation of values"""
-        if len(values) <= 1:
-            return 0.0
-        mean = sum(values) / len(values)
-        variance = sum((x - mean) ** 2 for x in values) / (len(values) - 1)
-        return variance ** 0.5
-    
     def get_aggregated_metrics(self, sensor_type: SensorType = None, location: str = None) -> Dict[str, Any]:
         """Get aggregated metrics for dashboard display"""
-        with self.aggregation_lock:
+        with QWriteLocker(self.aggregation_lock):
             metrics = {}
             
             locations = [location] if location else set(
@@ -395,59 +535,81 @@ class EdgeToFogAggregator(QObject):
             
             return metrics
     
-    def get_device_status(self) -> List[Dict]:
-        """Get status of all edge devices"""
-        with self.aggregation_lock:
+    def get_device_status(self) -> Tuple[Mapping[str, Any], ...]:
+        """Get status of all edge devices
+        
+        Returns a read-only snapshot, cached until a device changes and
+        shared by every caller on either thread.
+        """
+        with QReadLocker(self.aggregation_lock):
+            if self.device_status_cache is not None:
+                return self.device_status_cache
+        
+        # Built and published under the write lock, so an update can't land
+        # between reading the devices and caching the list
+        with QWriteLocker(self.aggregation_lock):
+            if self.device_status_cache is not None:
+                return self.device_status_cache
+            
             devices = []
             for device_id, info in self.edge_devices.items():
-                device_status = {
+                device_status = MappingProxyType({
                     'device_id': device_id,
                     'type': info['type'],
                     'location': info['location'],
                     'status': info['status'],
                     'battery_level': info.get('battery_level', 100.0),
                     'last_seen': info['last_seen'].isoformat(),
-                    'capabilities': [cap.value for cap in info['capabilities']]
-                }
+                    'capabilities': tuple(cap.value for cap in info['capabilities'])
+                })
                 devices.append(device_status)
             
-            return devices
+            self.device_status_cache = tuple(devices)
+            return self.device_status_cache
     
     def get_recent_anomalies(self, limit: int = 10) -> List[Dict]:
         """Get recent anomalies"""
-        with self.aggregation_lock:
-            recent_anomalies = sorted(self.anomalies, key=lambda x: x.timestamp, reverse=True)[:limit]
+        with QReadLocker(self.aggregation_lock):
+            recent_anomalies = itertools.islice(reversed(self.anomalies), limit)
             return [anomaly.to_dict() for anomaly in recent_anomalies]
     
+    def get_anomalies_since(self, seen: int, limit: int = 10) -> Tuple[int, List[Dict]]:
+        """Get anomalies recorded after the first `seen`, newest first
+        
+        Returns the new total to pass back as `seen` next time, and at most
+        `limit` of the new anomalies.
+        """
+        with QReadLocker(self.aggregation_lock):
+            new_count = min(self.anomaly_total - seen, limit, len(self.anomalies))
+            recent_anomalies = itertools.islice(reversed(self.anomalies), max(new_count, 0))
+            return self.anomaly_total, [anomaly.to_dict() for anomaly in recent_anomalies]
+    
+    @pyqtSlot()
     def cleanup_old_data(self):
         """Clean up old data to prevent memory overflow"""
-        with self.aggregation_lock:
-            current_time = datetime.now()
+        with QWriteLocker(self.aggregation_lock):
+            now = time.time()
             
-            # Clean raw data buffer (keep only last 2 hours)
-            for key in list(self.raw_data_buffer.keys()):
-                self.raw_data_buffer[key] = [
-                    r for r in self.raw_data_buffer[key] 
-                    if (current_time - r.timestamp).total_seconds() < 7200  # 2 hours
-                ]
+            # Evict expired readings from every window
+            for key in list(self.window_stats.keys()):
+                windows = self.window_stats[key]
+                for stats in windows.values():
+                    stats.evict(now)
                 
-                # Remove empty buffers
-                if not self.raw_data_buffer[key]:
-                    del self.raw_data_buffer[key]
+                # Remove streams with no readings left
+                if not any(stats.count for stats in windows.values()):
+                    del self.window_stats[key]
             
             # Clean aggregated data (keep only last 24 hours)
+            cutoff = datetime.fromtimestamp(now) - timedelta(seconds=86400)
             for key in list(self.aggregated_data.keys()):
                 self.aggregated_data[key] = [
                     agg for agg in self.aggregated_data[key] 
-                    if (current_time - agg.timestamp).total_seconds() < 86400  # 24 hours
+                    if agg.timestamp > cutoff
                 ]
                 
                 # Remove empty lists
                 if not self.aggregated_data[key]:
                     del self.aggregated_data[key]
             
-            # Clean old anomalies (keep only last 100)
-            if len(self.anomalies) > 100:
-                self.anomalies = sorted(self.anomalies, key=lambda x: x.timestamp, reverse=True)[:100]
-            
             self.logger.debug("Cleaned up old data")
\ No newline at end of file
@@ -1,106 +1,139 @@
-import sys
-import json
+import re
+import orjson
 import uuid
+import itertools
+import secrets
 import logging
-import requests
 import os
+import time
+from collections import OrderedDict, deque
+from functools import partial
 from PyQt5.QtWidgets import (QMainWindow, QVBoxLayout, QHBoxLayout, 
                              QWidget, QPushButton, QTextEdit, QLineEdit, QTabWidget,
                              QLabel, QGroupBox, QGridLayout, QMessageBox, QCheckBox,
                             )
-from PyQt5.QtCore import QDateTime, Qt, QTimer
+from PyQt5.QtCore import QTimer, QUrl, QByteArray, pyqtSlot
+from PyQt5.QtNetwork import QNetworkAccessManager, QNetworkRequest, QNetworkReply
 
 from modules.command_worker import CommandWorker
-from modules.styles import GreenhouseTheme, StyleSheetGenerator
+from modules.styles import DEFAULT_THEME, DEFAULT_GENERATOR, apply_style
 
-def setup_logging():
-    logging.basicConfig(
-        level=logging.INFO,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.StreamHandler(sys.stdout),
-            logging.FileHandler('greenhouse_system.log', encoding='utf-8')
-        ]
-    )
+# Button text keyword -> button style variant
+BUTTON_KEYWORD_STYLES = {
+    'read': 'primary', 'status': 'primary', 'list': 'primary', 'show': 'primary', 'send': 'primary',
+    'clear': 'secondary', 'cancel': 'secondary', 'test': 'secondary',
+    'refresh': 'outline', 'check': 'outline', 'view': 'outline',
+}
+# Variants in precedence order when a text matches more than one
+BUTTON_STYLE_PRECEDENCE = ('primary', 'secondary', 'outline')
+WORD_RE = re.compile(r"[a-z]+")
+# Longest pretty-printed JSON shown in the server panel
+MAX_JSON_DISPLAY = 64 * 1024
+# Oldest output lines are dropped past this many per text edit
+MAX_OUTPUT_BLOCKS = 2000
+# Output separators
+RESULT_SEP = "-" * 50
+SECTION_SEP = "=" * 50
+# /status sections and their titles, in the order the individual calls used
+STATUS_SECTIONS = (("health", "Server Health"), ("stats", "Server Statistics"), ("sessions", "Active Sessions"))
+# Result fields with their own rendering, checked in order; other dict
+# results are shown as JSON
+RESULT_FORMATTERS = (
+    ("output", lambda result: result["output"]),
+    ("newPath", lambda result: f"Changed to: {result['newPath']}"),
+)
+# Result entry tag, indexed by whether the result came from cache
+RESULT_TAGS = ("Result", "Result [CACHED]")
 
 class GreenhouseDesktop(QMainWindow):
     def __init__(self):
         super().__init__()
-        self.pending_commands = {}
+        self.pending_commands = OrderedDict()  # oldest first
+        self.max_pending_commands = 1024
         self.session_id = str(uuid.uuid4())
+        # Command ids only correlate responses: a random per-process prefix
+        # keeps them apart from other clients, a counter makes them unique here
+        self.command_id_prefix = secrets.token_hex(4)
+        self.command_counter = itertools.count(1)
         self.current_path = "/"
-        self.rabbitmq_connected = False
+        self.rabbitmq_connected = None  # unknown until the worker reports
         self.command_worker = None
+        self.error_box = None  # created on first error, then reused
+        self.clear_cache_box = None  # created on first Clear Cache, then reused
         
         # Use environment variable for backend URL with Docker fallback
         self.backend_url = os.getenv('BACKEND_URL', 'http://localhost:3000')
         
+        # Output lines are buffered per text edit and appended at most once
+        # per frame (~16ms)
+        self.log_buffers = {}
+        self.clock_cache = (0, "")  # (epoch second, formatted hh:mm:ss)
+        self.log_flush_timer = QTimer()
+        self.log_flush_timer.setSingleShot(True)
+        self.log_flush_timer.setInterval(16)
+        self.log_flush_timer.timeout.connect(self.flush_logs)
+        
+        self.auto_refresh_timer = QTimer()
+        self.auto_refresh_timer.timeout.connect(self.refresh_all_status)
+        # Backend calls run asynchronously on the event loop; the manager
+        # keeps a per-host pool of keep-alive connections, so repeated and
+        # auto-refresh calls reuse sockets instead of reconnecting
+        self.nam = QNetworkAccessManager(self)
+        
         # Initialize styling
-        self.theme = GreenhouseTheme()
-        self.styler = StyleSheetGenerator(self.theme)
+        self.theme = DEFAULT_THEME
+        self.styler = DEFAULT_GENERATOR
+        # Style role -> widgets styled with it; filled as widgets are created
+        self.styled_widgets = {}
+        # Connection badge style by state: None = connecting
+        self.connection_styles = {
+            None: self.styler.generate_connection_status_style("connecting"),
+            True: self.styler.generate_connection_status_style("connected"),
+            False: self.styler.generate_connection_status_style("disconnected"),
+        }
         
         self.logger = logging.getLogger('GreenhouseDesktop')
         self.logger.info(f"Starting application with session ID: {self.session_id}")
         self.logger.info(f"Backend URL: {self.backend_url}")
         
-        self.init_ui()
-        self.setup_command_worker()
-        self.apply_styles()
+        # Build and style everything before the first repaint
+        self.setUpdatesEnabled(False)
+        try:
+            self.init_ui()
+            self.setup_command_worker()
+            self.apply_styles()
+        finally:
+            self.setUpdatesEnabled(True)
         
     def apply_styles(self):
-        """Apply modern styles to all widgets"""
-        self.setStyleSheet(self.styler.generate_main_window_style())
-        self.apply_widget_styles()
+        """Apply the window-wide stylesheet; buttons and labels are styled as they are registered
+        
+        Type-level styles (group boxes, text and line edits, tabs, checkboxes)
+        cascade from this one sheet, so Qt parses them once.
+        """
+        self.setStyleSheet(self.styler.styles["global"])
         
     def apply_widget_styles(self):
-        """Apply styles to individual widget groups"""
-        buttons = self.findChildren(QPushButton)
-        for button in buttons:
-            text = button.text().lower()
-            if any(word in text for word in ['read', 'status', 'list', 'show', 'send']):
-                button.setStyleSheet(self.styler.generate_button_style("primary"))
-            elif any(word in text for word in ['clear', 'cancel', 'test']):
-                button.setStyleSheet(self.styler.generate_button_style("secondary"))
-            elif any(word in text for word in ['refresh', 'check', 'view']):
-                button.setStyleSheet(self.styler.generate_button_style("outline"))
-            else:
-                button.setStyleSheet(self.styler.generate_button_style("default"))
-        
-        group_boxes = self.findChildren(QGroupBox)
-        for group_box in group_boxes:
-            group_box.setStyleSheet(self.styler.generate_group_box_style())
-        
-        text_edits = self.findChildren(QTextEdit)
-        for text_edit in text_edits:
-            text_edit.setStyleSheet(self.styler.generate_text_edit_style())
-        
-        line_edits = self.findChildren(QLineEdit)
-        for line_edit in line_edits:
-            line_edit.setStyleSheet(self.styler.generate_line_edit_style())
-        
-        tab_widgets = self.findChildren(QTabWidget)
-        for tab_widget in tab_widgets:
-            tab_widget.setStyleSheet(self.styler.generate_tab_widget_style())
-        
-        checkboxes = self.findChildren(QCheckBox)
-        for checkbox in checkboxes:
-            checkbox.setStyleSheet(self.styler.generate_checkbox_style())
-        
-        self.apply_label_styles()
-        
-    def apply_label_styles(self):
-        """Apply specific styles to labels based on their content and role"""
-        labels = self.findChildren(QLabel)
-        for label in labels:
-            text = label.text().lower()
-            if any(word in text for word in ['session', 'current path']):
-                label.setStyleSheet(self.styler.generate_label_style("caption"))
-            elif label == self.connection_status:
-                pass
-            elif label == self.status_label:
-                label.setStyleSheet(self.styler.generate_label_style("body"))
-            else:
-                label.setStyleSheet(self.styler.generate_label_style("body"))
+        """Re-apply the stylesheet of every registered widget (e.g. after a theme change)"""
+        for role, widgets in self.styled_widgets.items():
+            style = self.role_style(role)
+            for widget in widgets:
+                apply_style(widget, style)
+        
+    def register_styled(self, widget, role):
+        """Record a widget under a style role ('button:primary', 'label:caption', ...) and style it"""
+        self.styled_widgets.setdefault(role, []).append(widget)
+        apply_style(widget, self.role_style(role))
+        return widget
+        
+    def role_style(self, role):
+        # The generator builds every role's stylesheet up front
+        return self.styler.styles[role]
+        
+    def button_role(self, text):
+        """Pick a button's style role from the keywords in its text"""
+        variants = {BUTTON_KEYWORD_STYLES.get(word) for word in WORD_RE.findall(text.lower())}
+        return "button:" + next((v for v in BUTTON_STYLE_PRECEDENCE if v in variants), "default")
         
     def init_ui(self):
         self.setWindowTitle("🌿 Greenhouse Automation Control System")
@@ -114,34 +147,18 @@ class GreenhouseDesktop(QMainWindow):
         
         # Session info
         session_layout = QHBoxLayout()
-        session_label = QLabel("Session:")
-        session_label.setStyleSheet(self.styler.generate_label_style("caption"))
+        session_label = self.register_styled(QLabel("Session:"), 'label:caption')
         session_layout.addWidget(session_label)
         
         self.session_label = QLabel(self.session_id[:8] + "...")
-        self.session_label.setStyleSheet(f"""
-            font-family: {self.theme.typography.font_family_mono}; 
-            color: {self.theme.colors.primary}; 
-            background-color: {self.theme.colors.grey_100};
-            padding: 2px 6px;
-            border-radius: {self.theme.borderRadius.sm};
-            font-weight: {self.theme.typography.medium};
-            border: 1px solid {self.theme.colors.grey_300};
-        """)
+        self.session_label.setStyleSheet(self.styler.generate_session_label_style())
         self.session_label.setToolTip(f"Full Session ID: {self.session_id}")
         session_layout.addWidget(self.session_label)
         session_layout.addStretch()
         
         # Connection status
         self.connection_status = QLabel("Connecting to RabbitMQ...")
-        self.connection_status.setStyleSheet(f"""
-            color: {self.theme.colors.warning}; 
-            font-weight: {self.theme.typography.medium};
-            background-color: {self.theme.colors.grey_100};
-            padding: 2px 6px;
-            border-radius: {self.theme.borderRadius.sm};
-            border: 1px solid {self.theme.colors.grey_300};
-        """)
+        self.connection_status.setStyleSheet(self.connection_styles[None])
         session_layout.addWidget(self.connection_status)
         
         layout.addLayout(session_layout)
@@ -151,35 +168,48 @@ class GreenhouseDesktop(QMainWindow):
         tabs.setDocumentMode(True)
         layout.addWidget(tabs)
         
-        # Create all tabs
-        user_tab = self.create_user_tab()
-        dev_tab = self.create_developer_tab()
-        server_tab = self.create_server_tab()
-        
-        tabs.addTab(user_tab, "🏠 Control")
-        tabs.addTab(dev_tab, "💻 Terminal")
-        tabs.addTab(server_tab, "📊 Server")
+        # Only the Control tab is built up front; the others are built the
+        # first time they are selected
+        self.tabs = tabs
+        self.tab_builders = {
+            1: (self.create_developer_tab, "💻 Terminal"),
+            2: (self.create_server_tab, "📊 Server"),
+        }
+        tabs.addTab(self.create_user_tab(), "🏠 Control")
+        for _, title in self.tab_builders.values():
+            tabs.addTab(QWidget(), title)
+        tabs.currentChanged.connect(self.build_tab)
         
         # Status area
         status_layout = QHBoxLayout()
-        status_label = QLabel("Status:")
-        status_label.setStyleSheet(self.styler.generate_label_style("caption"))
+        status_label = self.register_styled(QLabel("Status:"), 'label:body')
         status_layout.addWidget(status_label)
         
         self.status_label = QLabel("Ready")
-        self.status_label.setStyleSheet(f"""
-            color: {self.theme.colors.success};
-            font-weight: {self.theme.typography.medium};
-            background-color: {self.theme.colors.grey_50};
-            padding: 4px 8px;
-            border-radius: {self.theme.borderRadius.md};
-            border-left: 2px solid {self.theme.colors.success};
-        """)
+        self.status_label_style = None
+        self.set_status_style(self.styler.generate_status_label_style("ready"))
         status_layout.addWidget(self.status_label)
         status_layout.addStretch()
         
         layout.addLayout(status_layout)
         
+    def build_tab(self, index):
+        """Replace a placeholder tab with the real one on first activation"""
+        builder = self.tab_builders.pop(index, None)
+        if builder is None:
+            return
+        
+        create_tab, title = builder
+        widget = create_tab()
+        
+        placeholder = self.tabs.widget(index)
+        self.tabs.blockSignals(True)
+        self.tabs.removeTab(index)
+        self.tabs.insertTab(index, widget, title)
+        self.tabs.setCurrentIndex(index)
+        self.tabs.blockSignals(False)
+        placeholder.deleteLater()
+        
     def create_user_tab(self):
         widget = QWidget()
         layout = QVBoxLayout(widget)
@@ -191,32 +221,33 @@ class GreenhouseDesktop(QMainWindow):
         control_layout.setSpacing(6)
         control_layout.setContentsMargins(10, 16, 10, 10)
         
+        # (text, backend command, parameters, row, col)
         buttons = [
-            ("🌡️ Temperature", 0, 0),
-            ("💧 Humidity", 0, 1),
-            ("📊 System Status", 1, 0),
-            ("📁 List Files", 1, 1),
-            ("📂 Current Path", 2, 0)
+            ("🌡️ Temperature", "read_sensor", {"sensor": "temperature"}, 0, 0),
+            ("💧 Humidity", "read_sensor", {"sensor": "humidity"}, 0, 1),
+            ("📊 System Status", "system_status", None, 1, 0),
+            ("📁 List Files", "list_directory", None, 1, 1),
+            ("📂 Current Path", "get_current_path", None, 2, 0)
         ]
         
-        for text, row, col in buttons:
+        for text, command, parameters, row, col in buttons:
             btn = QPushButton(text)
-            btn.clicked.connect(lambda checked, cmd="read_sensor": self.send_user_command(cmd))
-            btn.setStyleSheet(self.styler.generate_button_style("primary"))
+            btn.clicked.connect(partial(self.send_user_command, command, parameters))
+            self.register_styled(btn, self.button_role(text))
             btn.setMinimumHeight(32)
             control_layout.addWidget(btn, row, col)
         
-        output_label = QLabel("Command Output:")
-        output_label.setStyleSheet(self.styler.generate_label_style("subtitle"))
+        output_label = self.register_styled(QLabel("Command Output:"), 'label:body')
         
         self.user_output = QTextEdit()
         self.user_output.setReadOnly(True)
         self.user_output.setPlaceholderText("Command results will appear here...")
         self.user_output.setMinimumHeight(300)
+        self.user_output.document().setMaximumBlockCount(MAX_OUTPUT_BLOCKS)
         
         btn_clear_user = QPushButton("🗑️ Clear Output")
-        btn_clear_user.clicked.connect(self.user_output.clear)
-        btn_clear_user.setStyleSheet(self.styler.generate_button_style("secondary"))
+        btn_clear_user.clicked.connect(lambda: self.clear_output(self.user_output))
+        self.register_styled(btn_clear_user, 'button:secondary')
         btn_clear_user.setMinimumHeight(28)
         
         layout.addWidget(control_group)
@@ -233,26 +264,16 @@ class GreenhouseDesktop(QMainWindow):
         layout.setContentsMargins(8, 8, 8, 8)
         
         path_layout = QHBoxLayout()
-        path_label = QLabel("Current Path:")
-        path_label.setStyleSheet(self.styler.generate_label_style("caption"))
+        path_label = self.register_styled(QLabel("Current Path:"), 'label:caption')
         path_layout.addWidget(path_label)
         
-        self.path_label = QLabel("/")
-        self.path_label.setStyleSheet(f"""
-            font-family: {self.theme.typography.font_family_mono}; 
-            background-color: {self.theme.colors.grey_100}; 
-            padding: 4px 8px;
-            border-radius: {self.theme.borderRadius.md};
-            border: 1px solid {self.theme.colors.grey_300};
-            color: {self.theme.colors.text_primary};
-            font-weight: {self.theme.typography.medium};
-        """)
+        self.path_label = QLabel(self.current_path)
+        self.path_label.setStyleSheet(self.styler.generate_path_label_style())
         path_layout.addWidget(self.path_label)
         path_layout.addStretch()
         
         history_layout = QHBoxLayout()
-        history_label = QLabel("Quick Commands:")
-        history_label.setStyleSheet(self.styler.generate_label_style("subtitle"))
+        history_label = self.register_styled(QLabel("Quick Commands:"), 'label:body')
         history_layout.addWidget(history_label)
         
         quick_commands = [
@@ -264,8 +285,8 @@ class GreenhouseDesktop(QMainWindow):
         
         for icon_text, command in quick_commands:
             btn = QPushButton(icon_text)
-            btn.clicked.connect(lambda checked, cmd=command: self.send_developer_command(cmd))
-            btn.setStyleSheet(self.styler.generate_button_style("outline"))
+            btn.clicked.connect(partial(self.send_developer_command, command))
+            self.register_styled(btn, self.button_role(icon_text))
             btn.setMinimumHeight(28)
             history_layout.addWidget(btn)
         
@@ -279,29 +300,29 @@ class GreenhouseDesktop(QMainWindow):
         
         btn_send = QPushButton("🚀 Send")
         btn_send.clicked.connect(self.send_developer_command)
-        btn_send.setStyleSheet(self.styler.generate_button_style("primary"))
+        self.register_styled(btn_send, 'button:primary')
         btn_send.setMinimumHeight(30)
         
         btn_cancel = QPushButton("❌ Cancel")
         btn_cancel.clicked.connect(self.cancel_last_command)
-        btn_cancel.setStyleSheet(self.styler.generate_button_style("secondary"))
+        self.register_styled(btn_cancel, 'button:secondary')
         btn_cancel.setMinimumHeight(30)
         
         input_layout.addWidget(self.command_input)
         input_layout.addWidget(btn_send)
         input_layout.addWidget(btn_cancel)
         
-        output_label = QLabel("Terminal Output:")
-        output_label.setStyleSheet(self.styler.generate_label_style("subtitle"))
+        output_label = self.register_styled(QLabel("Terminal Output:"), 'label:body')
         
         self.dev_output = QTextEdit()
         self.dev_output.setReadOnly(True)
         self.dev_output.setPlaceholderText("Terminal output will appear here...")
         self.dev_output.setMinimumHeight(300)
+        self.dev_output.document().setMaximumBlockCount(MAX_OUTPUT_BLOCKS)
         
         btn_clear_dev = QPushButton("🗑️ Clear Output")
-        btn_clear_dev.clicked.connect(self.dev_output.clear)
-        btn_clear_dev.setStyleSheet(self.styler.generate_button_style("secondary"))
+        btn_clear_dev.clicked.connect(lambda: self.clear_output(self.dev_output))
+        self.register_styled(btn_clear_dev, 'button:secondary')
         btn_clear_dev.setMinimumHeight(28)
         
         layout.addLayout(path_layout)
@@ -324,37 +345,29 @@ class GreenhouseDesktop(QMainWindow):
         server_layout.setSpacing(8)
         server_layout.setContentsMargins(12, 20, 12, 12)
         
+        # (text, callback, button style variant)
         server_buttons = [
-            ("❤️ Check Health", self.check_server_health),
-            ("📈 View Statistics", self.view_server_stats),
-            ("👥 List Sessions", self.list_sessions),
-            ("🔑 List Cache Keys", self.list_cache_keys),
-            ("🧹 Clear All Cache", self.clear_all_cache),
-            ("📨 Check Queues", self.check_queues),
-            ("⚡ Test Command", self.test_server_command),
-            ("🔄 Refresh All", self.refresh_all_status),
-            ("📋 List Log Files", self.list_log_files),
-            ("📖 View Session Log", self.view_session_log)
+            ("❤️ Check Health", self.check_server_health, "outline"),
+            ("📈 View Statistics", self.view_server_stats, "outline"),
+            ("👥 List Sessions", self.list_sessions, "primary"),
+            ("🔑 List Cache Keys", self.list_cache_keys, "primary"),
+            ("🧹 Clear All Cache", self.clear_all_cache, "secondary"),
+            ("📨 Check Queues", self.check_queues, "outline"),
+            ("⚡ Test Command", self.test_server_command, "secondary"),
+            ("🔄 Refresh All", self.refresh_all_status, "outline"),
+            ("📋 List Log Files", self.list_log_files, "primary"),
+            ("📖 View Session Log", self.view_session_log, "outline")
         ]
         
-        row, col = 0, 0
-        for text, callback in server_buttons:
+        for index, (text, callback, variant) in enumerate(server_buttons):
             btn = QPushButton(text)
             btn.clicked.connect(callback)
-            if "Clear" in text:
-                btn.setStyleSheet(self.styler.generate_button_style("secondary"))
-            elif "Refresh" in text or "Test" in text:
-                btn.setStyleSheet(self.styler.generate_button_style("outline"))
-            else:
-                btn.setStyleSheet(self.styler.generate_button_style("primary"))
+            self.register_styled(btn, f"button:{variant}")
+            row, col = divmod(index, 3)
             server_layout.addWidget(btn, row, col)
-            col += 1
-            if col > 2:
-                col = 0
-                row += 1
         
         log_selection_layout = QHBoxLayout()
-        log_selection_layout.addWidget(QLabel("Session ID:"))
+        log_selection_layout.addWidget(self.register_styled(QLabel("Session ID:"), 'label:caption'))
         self.session_log_input = QLineEdit()
         self.session_log_input.setPlaceholderText("Enter session ID to view log...")
         log_selection_layout.addWidget(self.session_log_input)
@@ -366,6 +379,7 @@ class GreenhouseDesktop(QMainWindow):
         self.server_info = QTextEdit()
         self.server_info.setReadOnly(True)
         self.server_info.setPlaceholderText("Server information will appear here...")
+        self.server_info.document().setMaximumBlockCount(MAX_OUTPUT_BLOCKS)
         
         refresh_layout = QHBoxLayout()
         self.auto_refresh = QCheckBox("🔄 Auto-refresh every 10 seconds")
@@ -373,8 +387,8 @@ class GreenhouseDesktop(QMainWindow):
         refresh_layout.addWidget(self.auto_refresh)
         refresh_layout.addStretch()
         
-        btn_clear_server = QPushButton("🗑️ Clear Output")
-        btn_clear_server.clicked.connect(self.server_info.clear)
+        btn_clear_server = self.register_styled(QPushButton("🗑️ Clear Output"), 'button:secondary')
+        btn_clear_server.clicked.connect(lambda: self.clear_output(self.server_info))
         refresh_layout.addWidget(btn_clear_server)
         
         info_layout.addWidget(self.server_info)
@@ -384,16 +398,11 @@ class GreenhouseDesktop(QMainWindow):
         layout.addLayout(log_selection_layout)
         layout.addWidget(info_group)
         
-        self.auto_refresh_timer = QTimer()
-        self.auto_refresh_timer.timeout.connect(self.refresh_all_status)
-        
         return widget
 
     def list_log_files(self):
         """List all session log files"""
-        result = self.make_server_request('/logs')
-        if result:
-            self.display_formatted_json("Session Log Files", result)
+        self.make_server_request('/logs', lambda result: self.display_formatted_json("Session Log Files", result))
 
     def view_session_log(self):
         """View specific session log"""
@@ -402,101 +411,134 @@ class GreenhouseDesktop(QMainWindow):
             self.show_error("Session ID Required", "Please enter a session ID")
             return
         
-        result = self.make_server_request(f'/sessions/{session_id}/log')
-        if result:
-            self.server_info.append(f"=== Session Log: {result.get('sessionId', 'Unknown')} ===\n")
-            self.server_info.append(f"Session Number: {result.get('sessionNumber', 'Unknown')}\n")
-            self.server_info.append(f"Log File: {result.get('logFile', 'Unknown')}\n")
-            self.server_info.append("=" * 50 + "\n")
-            self.server_info.append(result.get('content', 'No log content available'))
-            self.server_info.append("\n" + "=" * 50 + "\n")
+        self.make_server_request(f'/sessions/{session_id}/log', self.display_session_log)
         
+    def display_session_log(self, result):
+        """Display a session log returned by the backend"""
+        self._log(self.server_info, f"=== Session Log: {result.get('sessionId', 'Unknown')} ===\n")
+        self._log(self.server_info, f"Session Number: {result.get('sessionNumber', 'Unknown')}\n")
+        self._log(self.server_info, f"Log File: {result.get('logFile', 'Unknown')}\n")
+        self._log(self.server_info, SECTION_SEP + "\n")
+        self._log(self.server_info, result.get('content', 'No log content available'))
+        self._log(self.server_info, "\n" + SECTION_SEP + "\n")
+        
+    @pyqtSlot(bool)
     def toggle_auto_refresh(self, enabled):
+        timestamp = self.clock()
         if enabled:
             self.auto_refresh_timer.start(10000)  # 10 seconds
-            self.server_info.append(f"[{QDateTime.currentDateTime().toString('hh:mm:ss')}] Auto-refresh enabled")
+            self._log(self.server_info, f"[{timestamp}] Auto-refresh enabled")
         else:
             self.auto_refresh_timer.stop()
-            self.server_info.append(f"[{QDateTime.currentDateTime().toString('hh:mm:ss')}] Auto-refresh disabled")
+            self._log(self.server_info, f"[{timestamp}] Auto-refresh disabled")
         
     def refresh_all_status(self):
-        """Refresh all server status information"""
-        self.check_server_health()
-        self.view_server_stats()
-        self.list_sessions()
+        """Refresh all server status information with a single /status call"""
+        self.make_server_request('/status', self.display_status)
+        
+    def display_status(self, result):
+        """Show the health, stats and sessions sections of a /status reply"""
+        for key, title in STATUS_SECTIONS:
+            if key in result:
+                self.display_formatted_json(title, result[key])
+        
+    def make_server_request(self, endpoint, callback, method='GET', data=None):
+        """Send an HTTP request to the backend; callback gets the parsed JSON on success
+        
+        Returns immediately: QNetworkAccessManager does the network I/O off
+        the GUI thread and handle_server_reply runs when the reply finishes,
+        so several calls (e.g. refresh_all_status) are in flight at once.
+        """
+        url = f"{self.backend_url}{endpoint}"
+        self._log(self.server_info, f"[{self.clock()}] {method} {endpoint}")
+        
+        request = QNetworkRequest(QUrl(url))
+        request.setTransferTimeout(5000)
+        request.setRawHeader(b"Accept", b"application/json")
+        # Offer HTTP/2 (negotiated via ALPN) when BACKEND_URL is https, e.g.
+        # behind a TLS proxy; plain http:// to Express stays on HTTP/1.1
+        request.setAttribute(QNetworkRequest.Http2AllowedAttribute, True)
+        
+        if method == 'GET':
+            reply = self.nam.get(request)
+        elif method == 'DELETE':
+            reply = self.nam.deleteResource(request)
+        elif method == 'POST':
+            request.setHeader(QNetworkRequest.ContentTypeHeader, "application/json")
+            reply = self.nam.post(request, QByteArray(orjson.dumps(data)))
+        else:
+            self._log(self.server_info, f"Error: Unsupported method: {method}\n")
+            return
         
-    def make_server_request(self, endpoint, method='GET', data=None):
-        """Make HTTP request to backend server"""
+        reply.finished.connect(lambda: self.handle_server_reply(reply, callback))
+        
+    def handle_server_reply(self, reply, callback):
+        """Turn a finished backend reply into a callback or an error line"""
         try:
-            url = f"{self.backend_url}{endpoint}"
-            self.server_info.append(f"[{QDateTime.currentDateTime().toString('hh:mm:ss')}] {method} {endpoint}")
-            
-            if method == 'GET':
-                response = requests.get(url, timeout=5)
-            elif method == 'DELETE':
-                response = requests.delete(url, timeout=5)
-            elif method == 'POST':
-                response = requests.post(url, json=data, timeout=5)
-            else:
-                raise ValueError(f"Unsupported method: {method}")
+            status = reply.attribute(QNetworkRequest.HttpStatusCodeAttribute)
+            body = bytes(reply.readAll())
             
-            if response.status_code == 200:
-                return response.json()
+            if status == 200:
+                result = orjson.loads(body)
+                if result:
+                    callback(result)
+            elif status is not None:
+                self._log(self.server_info, f"Error: {status} - {body.decode(errors='replace')}\n")
+            elif reply.error() in (QNetworkReply.OperationCanceledError, QNetworkReply.TimeoutError):
+                self._log(self.server_info, "Error: Request timeout - server is not responding\n")
+            elif reply.error() in (QNetworkReply.ConnectionRefusedError, QNetworkReply.HostNotFoundError):
+                self._log(self.server_info, f"Error: Cannot connect to backend server at {self.backend_url}. Make sure it's running.\n")
             else:
-                self.server_info.append(f"Error: {response.status_code} - {response.text}\n")
-                return None
+                self._log(self.server_info, f"Error: {reply.errorString()}\n")
                 
-        except requests.exceptions.ConnectionError:
-            self.server_info.append(f"Error: Cannot connect to backend server at {self.backend_url}. Make sure it's running.\n")
-            return None
-        except requests.exceptions.Timeout:
-            self.server_info.append("Error: Request timeout - server is not responding\n")
-            return None
         except Exception as e:
-            self.server_info.append(f"Error: {str(e)}\n")
-            return None
+            self._log(self.server_info, f"Error: {str(e)}\n")
+        finally:
+            reply.deleteLater()
         
     def check_server_health(self):
         """Check server health status"""
-        result = self.make_server_request('/health')
-        if result:
-            self.display_formatted_json("Server Health", result)
+        self.make_server_request('/health', lambda result: self.display_formatted_json("Server Health", result))
         
     def view_server_stats(self):
         """View server statistics"""
-        result = self.make_server_request('/stats')
-        if result:
-            self.display_formatted_json("Server Statistics", result)
+        self.make_server_request('/stats', lambda result: self.display_formatted_json("Server Statistics", result))
         
     def list_sessions(self):
         """List active sessions"""
-        result = self.make_server_request('/sessions')
-        if result:
-            self.display_formatted_json("Active Sessions", result)
+        self.make_server_request('/sessions', lambda result: self.display_formatted_json("Active Sessions", result))
         
     def list_cache_keys(self):
         """List cache keys"""
-        result = self.make_server_request('/cache/keys')
-        if result:
-            self.display_formatted_json("Cache Keys", result)
+        self.make_server_request('/cache/keys', lambda result: self.display_formatted_json("Cache Keys", result))
         
     def clear_all_cache(self):
-        """Clear all cache"""
-        reply = QMessageBox.question(self, 'Clear Cache', 
-                                   'Are you sure you want to clear ALL cache?',
-                                   QMessageBox.Yes | QMessageBox.No,
-                                   QMessageBox.No)
-        
+        """Clear all cache, once the user confirms
+        
+        The confirmation is opened window-modal without a nested event loop;
+        the request is sent from on_clear_cache_confirm.
+        """
+        if self.clear_cache_box is None:
+            self.clear_cache_box = QMessageBox(self)
+            self.clear_cache_box.setIcon(QMessageBox.Question)
+            self.clear_cache_box.setWindowTitle('Clear Cache')
+            self.clear_cache_box.setText('Are you sure you want to clear ALL cache?')
+            self.clear_cache_box.setStandardButtons(QMessageBox.Yes | QMessageBox.No)
+            self.clear_cache_box.finished.connect(self.on_clear_cache_confirm)
+        
+        # A second click while the question is up doesn't ask again
+        if not self.clear_cache_box.isVisible():
+            self.clear_cache_box.setDefaultButton(QMessageBox.No)
+            self.clear_cache_box.open()
+        
+    def on_clear_cache_confirm(self, reply):
         if reply == QMessageBox.Yes:
-            result = self.make_server_request('/cache/clear', method='DELETE')
-            if result:
-                self.display_formatted_json("Cache Clear Result", result)
+            self.make_server_request('/cache/clear', lambda result: self.display_formatted_json("Cache Clear Result", result),
+                                     method='DELETE')
         
     def check_queues(self):
         """Check RabbitMQ queue status"""
-        result = self.make_server_request('/queues')
-        if result:
-            self.display_formatted_json("Queue Status", result)
+        self.make_server_request('/queues', lambda result: self.display_formatted_json("Queue Status", result))
         
     def test_server_command(self):
         """Test server command execution"""
@@ -504,15 +546,51 @@ class GreenhouseDesktop(QMainWindow):
             "command": "read_sensor",
             "parameters": {}
         }
-        result = self.make_server_request('/command', method='POST', data=command_data)
-        if result:
-            self.display_formatted_json("Test Command Result", result)
+        self.make_server_request('/command', lambda result: self.display_formatted_json("Test Command Result", result),
+                                 method='POST', data=command_data)
         
     def display_formatted_json(self, title, data):
         """Display formatted JSON in server info panel"""
-        self.server_info.append(f"=== {title} ===")
-        self.server_info.append(json.dumps(data, indent=2))
-        self.server_info.append("=" * 50 + "\n")
+        text = orjson.dumps(data, option=orjson.OPT_INDENT_2).decode()
+        if len(text) > MAX_JSON_DISPLAY:
+            text = text[:MAX_JSON_DISPLAY] + "\n…[truncated]"
+        self._log(self.server_info, f"=== {title} ===")
+        self._log(self.server_info, text)
+        self._log(self.server_info, SECTION_SEP + "\n")
+        
+    def next_command_id(self):
+        """Next correlation id for an outgoing command"""
+        return f"{self.command_id_prefix}-{next(self.command_counter):x}"
+
+    def clock(self):
+        """Current hh:mm:ss, reformatted only when the second changes"""
+        second = int(time.time())
+        if second != self.clock_cache[0]:
+            self.clock_cache = (second, time.strftime("%H:%M:%S", time.localtime(second)))
+        return self.clock_cache[1]
+        
+    def _log(self, edit, line):
+        """Queue a line for a text edit; queued lines are appended together"""
+        buffer = self.log_buffers.get(edit)
+        if buffer is None:
+            buffer = self.log_buffers[edit] = deque()
+        buffer.append(line)
+        if not self.log_flush_timer.isActive():
+            self.log_flush_timer.start()
+        
+    def flush_logs(self):
+        """Append every queued line with one append per text edit"""
+        for edit, lines in self.log_buffers.items():
+            if lines:
+                # Repaint once after the append rather than during it
+                edit.setUpdatesEnabled(False)
+                edit.append("\n".join(lines))
+                edit.setUpdatesEnabled(True)
+                lines.clear()
+        
+    def clear_output(self, edit):
+        self.log_buffers.pop(edit, None)
+        edit.clear()
         
     def setup_command_worker(self):
         self.logger.info("Setting up command worker")
@@ -521,47 +599,25 @@ class GreenhouseDesktop(QMainWindow):
         self.command_worker.connection_status.connect(self.update_connection_status)
         self.command_worker.error_occurred.connect(self.handle_error)
         
-        # Initial connection
+        # Initial connection; after a drop or failed attempt the worker
+        # reschedules itself with backoff, so there is nothing to poll
         self.command_worker.setup_rabbitmq()
         
-        # Setup connection check timer
-        self.connection_timer = QTimer()
-        self.connection_timer.timeout.connect(self.check_connection)
-        self.connection_timer.start(10000)
-        
+    @pyqtSlot(bool)
     def update_connection_status(self, connected):
+        # Repeated reports of the same state don't need a repolish
+        if connected == self.rabbitmq_connected:
+            return
         self.rabbitmq_connected = connected
         if connected:
             self.connection_status.setText("✅ Connected to RabbitMQ")
-            self.connection_status.setStyleSheet(f"""
-                color: {self.theme.colors.success}; 
-                font-weight: {self.theme.typography.medium};
-                background-color: {self.theme.colors.grey_100};
-                padding: 2px 6px;
-                border-radius: {self.theme.borderRadius.sm};
-                border: 1px solid {self.theme.colors.grey_300};
-                border-left: 2px solid {self.theme.colors.success};
-            """)
         else:
             self.connection_status.setText("❌ Disconnected from RabbitMQ")
-            self.connection_status.setStyleSheet(f"""
-                color: {self.theme.colors.error}; 
-                font-weight: {self.theme.typography.medium};
-                background-color: {self.theme.colors.grey_100};
-                padding: 2px 6px;
-                border-radius: {self.theme.borderRadius.sm};
-                border: 1px solid {self.theme.colors.grey_300};
-                border-left: 2px solid {self.theme.colors.error};
-            """)
-        
-    def check_connection(self):
-        if not self.rabbitmq_connected:
-            self.logger.info("Attempting to reconnect to RabbitMQ...")
-            self.command_worker.setup_rabbitmq()
+        self.connection_status.setStyleSheet(self.connection_styles[connected])
         
     def send_user_command(self, command, parameters=None):
         """Send a user command with automatic retry"""
-        command_id = str(uuid.uuid4())
+        command_id = self.next_command_id()
         command_data = {
             'commandId': command_id,
             'command': command,
@@ -570,36 +626,46 @@ class GreenhouseDesktop(QMainWindow):
             'sessionId': self.session_id
         }
         
-        self.pending_commands[command_id] = {
+        self.track_pending(command_id, {
             "type": "user",
             "command": command,
             "parameters": parameters or {}
-        }
-        
-        self.logger.info(f"Sending user command {command_id}: {command}")
+        })
         
-        import time
-        time.sleep(0.1)
+        self.logger.info("Sending user command %s: %s", command_id, command)
         
         if self.command_worker.send_command(command_data):
-            timestamp = QDateTime.currentDateTime().toString("hh:mm:ss")
-            self.user_output.append(f"[{timestamp}] Sent: {command}")
+            timestamp = self.clock()
+            self._log(self.user_output, f"[{timestamp}] Sent: {command}")
             return True
+        
+        # Retry from the event loop instead of sleeping on the GUI thread
+        self.logger.warning("First send attempt failed, attempting reconnect...")
+        QTimer.singleShot(100, lambda: self.retry_user_command(command_data))
+        return False
+        
+    def retry_user_command(self, command_data):
+        """Reconnect, then make one more attempt at sending a user command"""
+        if self.command_worker.attempt_reconnect():
+            QTimer.singleShot(100, lambda: self.resend_user_command(command_data))
         else:
-            self.logger.warning("First send attempt failed, attempting reconnect...")
-            if self.command_worker.attempt_reconnect():
-                time.sleep(0.1)
-                if self.command_worker.send_command(command_data):
-                    self.logger.info("Command sent successfully after reconnect")
-                    timestamp = QDateTime.currentDateTime().toString("hh:mm:ss")
-                    self.user_output.append(f"[{timestamp}] Sent: {command} [after reconnect]")
-                    return True
-            
-            self.logger.error("Failed to send command after retry")
-            timestamp = QDateTime.currentDateTime().toString("hh:mm:ss")
-            self.user_output.append(f"[{timestamp}] Failed to send: {command}")
-            return False
+            self.report_user_command_failed(command_data['command'])
         
+    def resend_user_command(self, command_data):
+        command = command_data['command']
+        if self.command_worker.send_command(command_data):
+            self.logger.info("Command sent successfully after reconnect")
+            timestamp = self.clock()
+            self._log(self.user_output, f"[{timestamp}] Sent: {command} [after reconnect]")
+        else:
+            self.report_user_command_failed(command)
+        
+    def report_user_command_failed(self, command):
+        self.logger.error("Failed to send command after retry")
+        timestamp = self.clock()
+        self._log(self.user_output, f"[{timestamp}] Failed to send: {command}")
+        
+    @pyqtSlot()
     def send_developer_command(self, command_text=None):
         if command_text is None:
             command_text = self.command_input.text().strip()
@@ -611,7 +677,7 @@ class GreenhouseDesktop(QMainWindow):
             self.show_error("Not connected to RabbitMQ", "Please check if RabbitMQ server is running")
             return
             
-        if hasattr(self, 'command_input') and self.command_input.text().strip() == command_text:
+        if 1 not in self.tab_builders and self.command_input.text().strip() == command_text:
             self.command_input.clear()
         
         if command_text.startswith('cd '):
@@ -622,7 +688,8 @@ class GreenhouseDesktop(QMainWindow):
             command = "execute_raw"
             parameters = {"raw_command": command_text}
         
-        command_id = str(uuid.uuid4())
+        now = time.localtime()
+        command_id = self.next_command_id()
         command_data = {
             "commandId": command_id,
             "command": command,
@@ -630,35 +697,41 @@ class GreenhouseDesktop(QMainWindow):
             "parameters": parameters,
             "sessionId": self.session_id,
             "raw_command": command_text,
-            "timestamp": QDateTime.currentDateTime().toString(Qt.ISODate)
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S", now)
         }
         
-        self.pending_commands[command_id] = {
+        self.track_pending(command_id, {
             "type": "developer",
             "command": command_text,
             "raw_command": command_text
-        }
+        })
         
         success = self.command_worker.send_command(command_data)
-        timestamp = QDateTime.currentDateTime().toString("hh:mm:ss")
+        timestamp = time.strftime("%H:%M:%S", now)
         if success:
-            self.dev_output.append(f"[{timestamp}] $ {command_text}")
+            self._log(self.dev_output, f"[{timestamp}] $ {command_text}")
             self.status_label.setText(f"Sent: {command_text}")
-            self.logger.info(f"Developer command {command_id} sent: {command_text}")
+            self.logger.info("Developer command %s sent: %s", command_id, command_text)
         else:
-            self.dev_output.append(f"[{timestamp}] $ {command_text} [FAILED TO SEND]")
+            self._log(self.dev_output, f"[{timestamp}] $ {command_text} [FAILED TO SEND]")
             self.status_label.setText(f"Failed to send: {command_text}")
-            self.logger.error(f"Failed to send developer command {command_id}: {command_text}")
+            self.logger.error("Failed to send developer command %s: %s", command_id, command_text)
+        
+    def track_pending(self, command_id, info):
+        """Remember a sent command, dropping the oldest once the cap is reached"""
+        self.pending_commands[command_id] = info
+        if len(self.pending_commands) > self.max_pending_commands:
+            self.pending_commands.popitem(last=False)
         
+    @pyqtSlot()
     def cancel_last_command(self):
         if self.pending_commands:
-            last_id = list(self.pending_commands.keys())[-1]
-            last_command = self.pending_commands[last_id]
-            del self.pending_commands[last_id]
+            _, last_command = self.pending_commands.popitem()
             self.status_label.setText(f"Cancelled: {last_command.get('command', 'last command')}")
-            self.dev_output.append(f"[{QDateTime.currentDateTime().toString('hh:mm:ss')}] Command cancelled: {last_command.get('command', 'last command')}")
-            self.logger.info(f"Cancelled command: {last_command.get('command', 'last command')}")
+            self._log(self.dev_output, f"[{self.clock()}] Command cancelled: {last_command.get('command', 'last command')}")
+            self.logger.info("Cancelled command: %s", last_command.get('command', 'last command'))
             
+    @pyqtSlot(object)
     def handle_response(self, response):
         command_id = response.get('commandId')
         result = response.get('result', {})
@@ -667,97 +740,102 @@ class GreenhouseDesktop(QMainWindow):
         session_id = response.get('sessionId')
         current_path = response.get('currentPath')
         
-        self.logger.info(f"Received response for command {command_id}, cached: {cached}, error: {bool(error)}")
+        self.logger.info("Received response for command %s, cached: %s, error: %s", command_id, cached, bool(error))
         
-        # DEBUG: Log pending commands
-        self.logger.info(f"Pending commands: {list(self.pending_commands.keys())}")
+        # Listing every pending id is only worth it when debugging
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("Pending commands: %s", list(self.pending_commands))
         
-        timestamp = QDateTime.currentDateTime().toString("hh:mm:ss")
+        timestamp = self.clock()
         
         if command_id in self.pending_commands:
             command_info = self.pending_commands[command_id]
-            self.logger.info(f"Found command info: type={command_info.get('type')}, command={command_info.get('command')}")
+            self.logger.info("Found command info: type=%s, command=%s", command_info.get('type'), command_info.get('command'))
             
             # Update current path if provided
             if current_path:
                 self.current_path = current_path
-                self.path_label.setText(self.current_path)
-                self.logger.info(f"Current path updated to: {self.current_path}")
+                if 1 not in self.tab_builders:
+                    self.path_label.setText(self.current_path)
+                self.logger.info("Current path updated to: %s", self.current_path)
             
             if error:
                 output_text = f"ERROR: {error}"
-                self.logger.error(f"Command {command_id} failed: {error}")
-            else:
-                if isinstance(result, dict):
-                    if 'output' in result:
-                        output_text = result['output']
-                    elif 'newPath' in result:
-                        output_text = result['output'] if 'output' in result else f"Changed to: {result['newPath']}"
-                    else:
-                        output_text = json.dumps(result, indent=2)
+                self.logger.error("Command %s failed: %s", command_id, error)
+            elif isinstance(result, dict):
+                for key, formatter in RESULT_FORMATTERS:
+                    if key in result:
+                        output_text = formatter(result)
+                        break
                 else:
-                    output_text = str(result)
+                    output_text = orjson.dumps(result, option=orjson.OPT_INDENT_2).decode()
+            else:
+                output_text = str(result)
             
-            cache_indicator = " [CACHED]" if cached else ""
-            session_indicator = f" [Session: {session_id[:8]}...]" if session_id else ""
+            tag = RESULT_TAGS[bool(cached)]
+            if session_id:
+                tag = f"{tag} [Session: {session_id[:8]}...]"
+            entry = self.format_result(timestamp, tag, output_text)
             
             if command_info['type'] == 'user':
-                self.logger.info(f"Appending to USER output: {output_text[:100]}...")
-                self.user_output.append(f"[{timestamp}] Result{cache_indicator}{session_indicator}:\n{output_text}\n{'-'*50}")
+                self.logger.info("Appending to USER output: %.100s...", output_text)
+                self._log(self.user_output, entry)
             else:
-                self.logger.info(f"Appending to DEV output: {output_text[:100]}...")
-                self.dev_output.append(f"[{timestamp}] Result{cache_indicator}{session_indicator}:\n{output_text}\n{'-'*50}")
+                self.logger.info("Appending to DEV output: %.100s...", output_text)
+                self._log(self.dev_output, entry)
                 
             del self.pending_commands[command_id]
             
         else:
-            self.logger.warning(f"Command ID {command_id} not found in pending_commands!")
+            self.logger.warning("Command ID %s not found in pending_commands!", command_id)
             # Fallback: try to display anyway
             if error:
                 output_text = f"ERROR: {error}"
             else:
                 output_text = str(result)
             
-            self.user_output.append(f"[{timestamp}] [UNKNOWN COMMAND] Result:\n{output_text}\n{'-'*50}")
+            self._log(self.user_output, self.format_result(timestamp, "[UNKNOWN COMMAND] Result", output_text))
             
         status_suffix = " (cached)" if cached else ""
         if error:
             self.status_label.setText(f"❌ Command failed{status_suffix}")
-            self.status_label.setStyleSheet(f"""
-                color: {self.theme.colors.error};
-                font-weight: {self.theme.typography.medium};
-                background-color: {self.theme.colors.grey_50};
-                padding: 6px 12px;
-                border-radius: {self.theme.borderRadius.md};
-                border-left: 3px solid {self.theme.colors.error};
-            """)
+            self.set_status_style(self.styler.styles["status_label:error"])
         else:
             self.status_label.setText(f"✅ Command completed{status_suffix}")
-            self.status_label.setStyleSheet(f"""
-                color: {self.theme.colors.success};
-                font-weight: {self.theme.typography.medium};
-                background-color: {self.theme.colors.grey_50};
-                padding: 6px 12px;
-                border-radius: {self.theme.borderRadius.md};
-                border-left: 3px solid {self.theme.colors.success};
-            """)
+            self.set_status_style(self.styler.styles["status_label:success"])
 
+    def format_result(self, timestamp, tag, body):
+        """Compose one result entry for an output panel"""
+        return f"[{timestamp}] {tag}:\n{body}\n{RESULT_SEP}"
+
+    def set_status_style(self, style):
+        """Apply a cached status line style unless it is already applied"""
+        if style is not self.status_label_style:
+            self.status_label_style = style
+            self.status_label.setStyleSheet(style)
+
+    @pyqtSlot(str)
     def handle_error(self, error_message):
         self.logger.error(f"Command worker error: {error_message}")
         self.show_error("System Error", error_message)
 
     def show_error(self, title, message):
-        self.logger.warning(f"Showing error dialog: {title} - {message}")
-        msg = QMessageBox()
-        msg.setIcon(QMessageBox.Critical)
-        msg.setWindowTitle(title)
-        msg.setText(message)
-        msg.exec_()
+        self.logger.warning("Showing error dialog: %s - %s", title, message)
+        if self.error_box is None:
+            self.error_box = QMessageBox(self)
+            self.error_box.setIcon(QMessageBox.Critical)
+            self.error_box.setModal(False)
+        
+        # Non-modal, so no nested event loop; while it is open, newer errors
+        # just replace its text
+        self.error_box.setWindowTitle(title)
+        self.error_box.setText(message)
+        self.error_box.show()
+        self.error_box.raise_()
 
     def closeEvent(self, event):
         self.logger.info("Application shutting down")
         if self.command_worker:
             self.command_worker.disconnect()
-        if self.auto_refresh_timer.isActive():
-            self.auto_refresh_timer.stop()
+        self.auto_refresh_timer.stop()  # no-op if it isn't running
         event.accept()
\ No newline at end of file
@@ -0,0 +1,12 @@
+import sys
+import logging
+
+def setup_logging():
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.StreamHandler(sys.stdout),
+            logging.FileHandler('greenhouse_system.log', encoding='utf-8')
+        ]
+    )
@@ -1,50 +1,215 @@
+import re
 import sys
-import json
+import orjson
 import uuid
+import itertools
+import secrets
 import logging
-import requests
 import os
+import time
 import math
 import random
+from collections import deque
 from datetime import datetime
+from functools import partial
 from PyQt5.QtWidgets import (QMainWindow, QVBoxLayout, QHBoxLayout, 
                              QWidget, QPushButton, QTextEdit, QLineEdit, QTabWidget,
                              QLabel, QGroupBox, QGridLayout, QMessageBox, QCheckBox,
                              QTableWidget, QTableWidgetItem, QHeaderView, QComboBox,
                              QListWidget, QListWidgetItem
                             )
-from PyQt5.QtCore import QDateTime, Qt, QTimer
+from PyQt5.QtCore import (QMetaObject, QObject, Qt, QTimer,
+                          QUrl, QByteArray, pyqtSlot)
 from PyQt5.QtGui import QColor
+from PyQt5.QtNetwork import QNetworkAccessManager, QNetworkRequest, QNetworkReply
 
 from modules.command_worker import CommandWorker
-from modules.styles import GreenhouseTheme, StyleSheetGenerator
+from modules.styles import DEFAULT_THEME, DEFAULT_GENERATOR, apply_style
+from modules.logging_setup import setup_logging
 from modules.edge_fog_aggregator import EdgeToFogAggregator, SensorType, SensorReading
 
-def setup_logging():
-    logging.basicConfig(
-        level=logging.INFO,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.StreamHandler(sys.stdout),
-            logging.FileHandler('greenhouse_system.log', encoding='utf-8')
-        ]
-    )
+# Button style variants in precedence order; substring match on the lowercased text
+BUTTON_ROLE_PATTERNS = (
+    ("primary", re.compile("read|status|list|show|send")),
+    ("secondary", re.compile("clear|cancel|test")),
+    ("outline", re.compile("refresh|check|view")),
+)
+CAPTION_LABEL_RE = re.compile("session|current path")
+
+# /status sections and their titles, in the order the individual calls used
+STATUS_SECTIONS = (("health", "Server Health"), ("stats", "Server Statistics"), ("sessions", "Active Sessions"))
+# Oldest output lines are dropped past this many per text edit
+MAX_OUTPUT_BLOCKS = 2000
+# Result fields with their own rendering, checked in order; other dict
+# results are shown as JSON
+RESULT_FORMATTERS = (
+    ("output", lambda result: result["output"]),
+    ("newPath", lambda result: f"Changed to: {result['newPath']}"),
+)
+# Most recent anomalies kept in the anomalies list
+ANOMALY_LIST_SIZE = 20
+
+# Repeats of a critical anomaly inside this window don't raise another alert
+ALERT_DEDUPE_SECONDS = 5.0
+
+# Sensor type by its string value; cheaper than calling SensorType(value)
+SENSOR_TYPES_BY_VALUE = {sensor_type.value: sensor_type for sensor_type in SensorType}
+
+# Demo reading ranges per sensor type value as (low, span):
+# value = low + span * U[0, 1). Keyed by string, which hashes in C
+DEMO_VALUE_RANGES = {
+    SensorType.TEMPERATURE.value: (22.0, 6.0),
+    SensorType.HUMIDITY.value: (45.0, 30.0),
+    SensorType.SOIL_MOISTURE.value: (35.0, 30.0),
+    SensorType.LIGHT_INTENSITY.value: (100.0, 700.0),
+    SensorType.CO2_LEVEL.value: (400.0, 800.0),
+    SensorType.SOIL_PH.value: (6.0, 1.0)
+}
+# Light intensity follows a day/night cycle instead of the base range
+DEMO_DAY_LIGHT = (300.0, 500.0)
+DEMO_NIGHT_LIGHT = (0.0, 50.0)
+# Demo device placement and the capabilities they're drawn from
+DEMO_LOCATIONS = ('north_wing', 'south_wing', 'herb_garden', 'tropical_zone', 'seedling_area')
+DEMO_CAPABILITIES = tuple(SensorType)
+
+class DemoSensorFeed(QObject):
+    """Feeds demo sensor readings to the aggregator from its worker thread
+    
+    Readings are generated on the aggregator's QThread so a tick never
+    stalls the GUI; results reach the GUI through the aggregator's signals.
+    """
+    
+    def __init__(self, aggregator, interval=10000):
+        super().__init__()
+        self.aggregator = aggregator
+        self.rng = random.Random()  # private stream, not the shared module state
+        self.timer = QTimer(self)
+        self.timer.setInterval(interval)
+        self.timer.timeout.connect(self.generate)
+        self.moveToThread(aggregator.worker_thread)
+        aggregator.worker_thread.finished.connect(self.stop, Qt.DirectConnection)
+    
+    @pyqtSlot()
+    def start(self):
+        """Start the timer (invoke queued so it runs in the worker thread)"""
+        self.timer.start()
+    
+    @pyqtSlot()
+    def stop(self):
+        self.timer.stop()
+    
+    @pyqtSlot()
+    def generate(self):
+        """Generate demo sensor data for testing"""
+        devices = self.aggregator.get_device_status()
+        readings = []
+        draw = self.rng.random
+        
+        # Daily patterns only depend on the hour, so fold them into this
+        # tick's ranges: temperature follows a daily curve, light a
+        # day/night cycle
+        now = datetime.now()
+        low, span = DEMO_VALUE_RANGES[SensorType.TEMPERATURE.value]
+        ranges = dict(DEMO_VALUE_RANGES)
+        ranges[SensorType.TEMPERATURE.value] = (low + 5 * math.sin(now.hour * math.pi / 12), span)
+        ranges[SensorType.LIGHT_INTENSITY.value] = DEMO_DAY_LIGHT if 6 <= now.hour <= 18 else DEMO_NIGHT_LIGHT
+        
+        for device in devices:
+            device_id = device['device_id']
+            location = device['location']
+            
+            # Simulate occasional device offline status; update_device_status
+            # takes the aggregator lock since the GUI thread reads concurrently
+            if draw() < 0.05:  # 5% chance to go offline
+                self.aggregator.update_device_status(device_id, 'offline')
+                continue
+            else:
+                self.aggregator.update_device_status(device_id, 'online', 20 + 80 * draw())
+            
+            # Generate readings for each capability
+            for capability in device['capabilities']:
+                low, span = ranges[capability]
+                
+                readings.append(SensorReading(
+                    device_id=device_id,
+                    sensor_type=SENSOR_TYPES_BY_VALUE[capability],
+                    value=low + span * draw(),
+                    timestamp=now,
+                    location=location,
+                    quality=0.7 + 0.3 * draw(),
+                    battery_level=20 + 80 * draw(),
+                    signal_strength=-50 + 20 * draw()
+                ))
+        
+        # Hand the whole tick to the aggregator at once
+        if readings:
+            self.aggregator.add_sensor_readings(readings)
 
 class GreenhouseDesktop(QMainWindow):
     def __init__(self):
         super().__init__()
         self.pending_commands = {}
         self.session_id = str(uuid.uuid4())
+        # Command ids only correlate responses: a random per-process prefix
+        # keeps them apart from other clients, a counter makes them unique here
+        self.command_id_prefix = secrets.token_hex(4)
+        self.command_counter = itertools.count(1)
         self.current_path = "/"
-        self.rabbitmq_connected = False
+        self.rabbitmq_connected = None  # unknown until the worker reports
+        self.clock_cache = (0, "")  # (epoch second, formatted hh:mm:ss)
         self.command_worker = None
         
         # Use environment variable for backend URL with Docker fallback
         self.backend_url = os.getenv('BACKEND_URL', 'http://localhost:3000')
+        # Async HTTP with keep-alive connection reuse; replies arrive as signals
+        self.nam = QNetworkAccessManager(self)
+        
+        # Output lines are buffered per text edit and appended at most once
+        # per frame (~16ms)
+        self.log_buffers = {}
+        self.log_flush_timer = QTimer(self)
+        self.log_flush_timer.setSingleShot(True)
+        self.log_flush_timer.setInterval(16)
+        self.log_flush_timer.timeout.connect(self.flush_logs)
         
         # Initialize styling
-        self.theme = GreenhouseTheme()
-        self.styler = StyleSheetGenerator(self.theme)
+        self.theme = DEFAULT_THEME
+        self.styler = DEFAULT_GENERATOR
+        self.styled_widgets = None  # filled by collect_styled_widgets()
+        # Connection badge style by state: None = connecting
+        self.connection_styles = {
+            None: self.styler.generate_connection_status_style("connecting"),
+            True: self.styler.generate_connection_status_style("connected"),
+            False: self.styler.generate_connection_status_style("disconnected"),
+        }
+        self.rng = random.Random()
+        self.status_colors = {
+            'online': QColor(self.theme.colors.success),
+            'offline': QColor(self.theme.colors.error),
+            'unknown': QColor(self.theme.colors.warning)
+        }
+        self.severity_colors = {
+            'critical': QColor(self.theme.colors.error),
+            'warning': QColor(self.theme.colors.warning),
+            'info': QColor(self.theme.colors.info)
+        }
+        
+        # devices_table bookkeeping: device_id -> row, and the cell texts
+        # last written to that row
+        self.device_rows = {}
+        self.device_cells = {}
+        self.anomalies_seen = 0  # aggregator anomaly total already listed
+        self.alert_box = None  # created on the first critical anomaly, then reused
+        self.error_box = None  # created on first error, then reused
+        self.clear_cache_box = None  # created on first Clear Cache, then reused
+        self.alert_times = {}  # (sensor, location, type) -> last alert, monotonic
+        
+        # Edge tab views are refreshed at most every 250ms however many
+        # aggregator signals arrive in between
+        self.metrics_refresh_timer = self.make_refresh_timer(self.update_edge_metrics_display)
+        self.devices_refresh_timer = self.make_refresh_timer(self.update_devices_table)
+        self.anomalies_refresh_timer = self.make_refresh_timer(self.update_anomalies_list)
+        self.edge_tab_stale = False  # edge views skipped updates while hidden
         
         # Initialize edge-to-fog aggregator
         self.edge_aggregator = EdgeToFogAggregator()
@@ -58,6 +223,31 @@ class GreenhouseDesktop(QMainWindow):
         self.setup_edge_aggregator()
         self.apply_styles()
         
+    def make_refresh_timer(self, slot):
+        """Single-shot 250ms timer that runs slot once per burst of requests"""
+        timer = QTimer(self)
+        timer.setSingleShot(True)
+        timer.setInterval(250)
+        timer.timeout.connect(slot)
+        return timer
+    
+    def schedule_refresh(self, timer):
+        """Coalesce refresh requests into the pending timer shot"""
+        # Nothing to repaint while the edge tab is hidden; catch up on show
+        if self.tabs.currentWidget() is not self.edge_tab:
+            self.edge_tab_stale = True
+            return
+        if not timer.isActive():
+            timer.start()
+    
+    def on_tab_changed(self, index):
+        """Bring the edge views up to date when their tab is shown"""
+        if self.edge_tab_stale and self.tabs.widget(index) is self.edge_tab:
+            self.edge_tab_stale = False
+            self.update_devices_table()
+            self.update_edge_metrics_display()
+            self.update_anomalies_list()
+        
     def setup_edge_aggregator(self):
         """Setup edge aggregator signals and demo data"""
         # Connect aggregator signals
@@ -68,10 +258,9 @@ class GreenhouseDesktop(QMainWindow):
         # Register some demo edge devices
         self.register_demo_devices()
         
-        # Setup demo data timer
-        self.demo_data_timer = QTimer()
-        self.demo_data_timer.timeout.connect(self.generate_demo_sensor_data)
-        self.demo_data_timer.start(10000)  # Generate demo data every 10 seconds
+        # Setup demo data feed
+        self.demo_feed = DemoSensorFeed(self.edge_aggregator, 10000)  # every 10 seconds
+        QMetaObject.invokeMethod(self.demo_feed, "start", Qt.QueuedConnection)
         
     def register_demo_devices(self):
         """Register demo edge devices for testing"""
@@ -104,79 +293,19 @@ class GreenhouseDesktop(QMainWindow):
                 device['capabilities']
             )
     
-    def generate_demo_sensor_data(self):
-        """Generate demo sensor data for testing"""
-        devices = self.edge_aggregator.get_device_status()
-        
-        for device in devices:
-            device_id = device['device_id']
-            location = device['location']
-            capabilities = [SensorType(cap) for cap in device['capabilities']]
-            
-            # Simulate occasional device offline status
-            if random.random() < 0.05:  # 5% chance to go offline
-                self.edge_aggregator.update_device_status(device_id, 'offline')
-                continue
-            else:
-                self.edge_aggregator.update_device_status(device_id, 'online', random.uniform(20, 100))
-            
-            # Generate readings for each capability
-            for sensor_type in capabilities:
-                # Base values with some variation
-                base_values = {
-                    SensorType.TEMPERATURE: (22.0, 28.0),
-                    SensorType.HUMIDITY: (45.0, 75.0),
-                    SensorType.SOIL_MOISTURE: (35.0, 65.0),
-                    SensorType.LIGHT_INTENSITY: (100.0, 800.0),
-                    SensorType.CO2_LEVEL: (400.0, 1200.0),
-                    SensorType.SOIL_PH: (6.0, 7.0)
-                }
-                
-                base_min, base_max = base_values.get(sensor_type, (0.0, 100.0))
-                value = random.uniform(base_min, base_max)
-                
-                # Add some realistic patterns
-                current_hour = datetime.now().hour
-                if sensor_type == SensorType.TEMPERATURE:
-                    # Temperature follows daily pattern
-                    value += 5 * math.sin(current_hour * math.pi / 12)
-                elif sensor_type == SensorType.LIGHT_INTENSITY:
-                    # Light intensity follows day/night cycle
-                    if 6 <= current_hour <= 18:  # Daytime
-                        value = random.uniform(300, 800)
-                    else:  # Nighttime
-                        value = random.uniform(0, 50)
-                
-                reading = SensorReading(
-                    device_id=device_id,
-                    sensor_type=sensor_type,
-                    value=value,
-                    timestamp=datetime.now(),
-                    location=location,
-                    quality=random.uniform(0.7, 1.0),
-                    battery_level=random.uniform(20, 100),
-                    signal_strength=random.uniform(-50, -30)
-                )
-                
-                self.edge_aggregator.add_sensor_reading(reading)
-    
     def on_new_aggregated_data(self, data):
         """Handle new aggregated data"""
-        timestamp = QDateTime.currentDateTime().toString("hh:mm:ss")
-        self.logger.debug(f"New aggregated data: {data['sensor_type']} at {data['location']}")
+        self.logger.debug("New aggregated data: %s at %s", data['sensor_type'], data['location'])
         
-        # Update edge monitoring tab if it exists
-        if hasattr(self, 'edge_metrics_display'):
-            self.update_edge_metrics_display()
+        # The edge widgets exist before the aggregator signals are connected
+        self.schedule_refresh(self.metrics_refresh_timer)
     
     def on_anomaly_detected(self, anomaly):
         """Handle detected anomalies"""
-        timestamp = QDateTime.currentDateTime().toString("hh:mm:ss")
-        self.logger.warning(f"Anomaly detected: {anomaly['message']}")
+        self.logger.warning("Anomaly detected: %s", anomaly['message'])
         
         # Update anomalies list
-        if hasattr(self, 'anomalies_list'):
-            self.update_anomalies_list()
+        self.schedule_refresh(self.anomalies_refresh_timer)
         
         # Show notification for critical anomalies
         if anomaly['severity'] == 'critical':
@@ -184,76 +313,93 @@ class GreenhouseDesktop(QMainWindow):
     
     def on_device_status_changed(self, device_info):
         """Handle device status changes"""
-        self.logger.info(f"Device status changed: {device_info['device_id']} - {device_info['status']}")
+        self.logger.info("Device status changed: %s - %s", device_info['device_id'], device_info['status'])
         
         # Update devices table
-        if hasattr(self, 'devices_table'):
-            self.update_devices_table()
+        self.schedule_refresh(self.devices_refresh_timer)
     
     def show_anomaly_alert(self, anomaly):
-        """Show alert for critical anomalies"""
-        msg = QMessageBox()
-        msg.setIcon(QMessageBox.Warning)
-        msg.setWindowTitle("🚨 Critical Anomaly Detected")
-        msg.setText(anomaly['message'])
-        msg.setInformativeText(f"Location: {anomaly['location']}\nValue: {anomaly['value']:.1f}")
-        msg.setStandardButtons(QMessageBox.Ok)
-        msg.exec_()
+        """Show alert for critical anomalies
+        
+        The alert is non-modal so aggregator signals keep flowing while it is
+        open, and repeats of the same anomaly within ALERT_DEDUPE_SECONDS are
+        not shown again.
+        """
+        now = time.monotonic()
+        key = (anomaly['sensor_type'], anomaly['location'], anomaly['anomaly_type'])
+        if now - self.alert_times.get(key, float('-inf')) < ALERT_DEDUPE_SECONDS:
+            return
+        self.alert_times = {k: t for k, t in self.alert_times.items()
+                            if now - t < ALERT_DEDUPE_SECONDS}
+        self.alert_times[key] = now
+        
+        if self.alert_box is None:
+            self.alert_box = QMessageBox(self)
+            self.alert_box.setIcon(QMessageBox.Warning)
+            self.alert_box.setWindowTitle("🚨 Critical Anomaly Detected")
+            self.alert_box.setStandardButtons(QMessageBox.Ok)
+            self.alert_box.setModal(False)
+        
+        self.alert_box.setText(anomaly['message'])
+        self.alert_box.setInformativeText(f"Location: {anomaly['location']}\nValue: {anomaly['value']:.1f}")
+        self.alert_box.show()
+        self.alert_box.raise_()
         
     def apply_styles(self):
-        """Apply modern styles to all widgets"""
-        self.setStyleSheet(self.styler.generate_main_window_style())
+        """Apply modern styles to all widgets
+        
+        Type-level styles (group boxes, text and line edits, tabs, checkboxes)
+        come from one window-wide stylesheet, so Qt parses them once; only
+        buttons and labels get per-widget sheets.
+        """
+        self.setStyleSheet(self.styler.styles["global"])
         self.apply_widget_styles()
         
     def apply_widget_styles(self):
-        """Apply styles to individual widget groups"""
-        buttons = self.findChildren(QPushButton)
-        for button in buttons:
-            text = button.text().lower()
-            if any(word in text for word in ['read', 'status', 'list', 'show', 'send']):
-                button.setStyleSheet(self.styler.generate_button_style("primary"))
-            elif any(word in text for word in ['clear', 'cancel', 'test']):
-                button.setStyleSheet(self.styler.generate_button_style("secondary"))
-            elif any(word in text for word in ['refresh', 'check', 'view']):
-                button.setStyleSheet(self.styler.generate_button_style("outline"))
-            else:
-                button.setStyleSheet(self.styler.generate_button_style("default"))
-        
-        group_boxes = self.findChildren(QGroupBox)
-        for group_box in group_boxes:
-            group_box.setStyleSheet(self.styler.generate_group_box_style())
+        """Apply the per-widget button and label styles"""
+        widgets = self.collect_styled_widgets()
+        # Stylesheets come from the generator, keyed by style role
+        styles = self.styler.styles
         
-        text_edits = self.findChildren(QTextEdit)
-        for text_edit in text_edits:
-            text_edit.setStyleSheet(self.styler.generate_text_edit_style())
+        for button in widgets['button']:
+            apply_style(button, styles['button:' + button.property('role')])
         
-        line_edits = self.findChildren(QLineEdit)
-        for line_edit in line_edits:
-            line_edit.setStyleSheet(self.styler.generate_line_edit_style())
-        
-        tab_widgets = self.findChildren(QTabWidget)
-        for tab_widget in tab_widgets:
-            tab_widget.setStyleSheet(self.styler.generate_tab_widget_style())
+        self.apply_label_styles()
         
-        checkboxes = self.findChildren(QCheckBox)
-        for checkbox in checkboxes:
-            checkbox.setStyleSheet(self.styler.generate_checkbox_style())
+    def collect_styled_widgets(self):
+        """Scan the widget tree once; reset styled_widgets to None to rescan"""
+        if self.styled_widgets is None:
+            buttons = self.findChildren(QPushButton)
+            for button in buttons:
+                button.setProperty('role', self.button_role(button.text()))
+            
+            self.styled_widgets = {
+                'button': buttons,
+                'label': self.findChildren(QLabel),
+            }
+        return self.styled_widgets
         
-        self.apply_label_styles()
+    def button_role(self, text):
+        """Button style variant for a button's text"""
+        text = text.lower()
+        for variant, pattern in BUTTON_ROLE_PATTERNS:
+            if pattern.search(text):
+                return variant
+        return "default"
         
     def apply_label_styles(self):
         """Apply specific styles to labels based on their content and role"""
-        labels = self.findChildren(QLabel)
-        for label in labels:
-            text = label.text().lower()
-            if any(word in text for word in ['session', 'current path']):
-                label.setStyleSheet(self.styler.generate_label_style("caption"))
+        caption_style = self.styler.styles["label:caption"]
+        body_style = self.styler.styles["label:body"]
+        for label in self.collect_styled_widgets()['label']:
+            if CAPTION_LABEL_RE.search(label.text().lower()):
+                apply_style(label, caption_style)
             elif label == self.connection_status:
                 pass
             elif label == self.status_label:
-                label.setStyleSheet(self.styler.generate_label_style("body"))
+                self.set_status_style(body_style)
             else:
-                label.setStyleSheet(self.styler.generate_label_style("body"))
+                apply_style(label, body_style)
         
     def init_ui(self):
         self.setWindowTitle("🌿 Greenhouse Automation Control System")
@@ -272,48 +418,34 @@ class GreenhouseDesktop(QMainWindow):
         session_layout.addWidget(session_label)
         
         self.session_label = QLabel(self.session_id[:8] + "...")
-        self.session_label.setStyleSheet(f"""
-            font-family: {self.theme.typography.font_family_mono}; 
-            color: {self.theme.colors.primary}; 
-            background-color: {self.theme.colors.grey_100};
-            padding: 2px 6px;
-            border-radius: {self.theme.borderRadius.sm};
-            font-weight: {self.theme.typography.medium};
-            border: 1px solid {self.theme.colors.grey_300};
-        """)
+        self.session_label.setStyleSheet(self.styler.generate_session_label_style())
         self.session_label.setToolTip(f"Full Session ID: {self.session_id}")
         session_layout.addWidget(self.session_label)
         session_layout.addStretch()
         
         # Connection status
         self.connection_status = QLabel("Connecting to RabbitMQ...")
-        self.connection_status.setStyleSheet(f"""
-            color: {self.theme.colors.warning}; 
-            font-weight: {self.theme.typography.medium};
-            background-color: {self.theme.colors.grey_100};
-            padding: 2px 6px;
-            border-radius: {self.theme.borderRadius.sm};
-            border: 1px solid {self.theme.colors.grey_300};
-        """)
+        self.connection_status.setStyleSheet(self.connection_styles[None])
         session_layout.addWidget(self.connection_status)
         
         layout.addLayout(session_layout)
         
         # Create tabs
-        tabs = QTabWidget()
+        self.tabs = tabs = QTabWidget()
         tabs.setDocumentMode(True)
         layout.addWidget(tabs)
         
         # Create all tabs
         user_tab = self.create_user_tab()
         dev_tab = self.create_developer_tab()
-        edge_tab = self.create_edge_monitoring_tab()
+        self.edge_tab = self.create_edge_monitoring_tab()
         server_tab = self.create_server_tab()
         
         tabs.addTab(user_tab, "🏠 Control")
         tabs.addTab(dev_tab, "💻 Terminal")
-        tabs.addTab(edge_tab, "📡 Edge Devices")
+        tabs.addTab(self.edge_tab, "📡 Edge Devices")
         tabs.addTab(server_tab, "📊 Server")
+        tabs.currentChanged.connect(self.on_tab_changed)
         
         # Status area
         status_layout = QHBoxLayout()
@@ -322,14 +454,8 @@ class GreenhouseDesktop(QMainWindow):
         status_layout.addWidget(status_label)
         
         self.status_label = QLabel("Ready")
-        self.status_label.setStyleSheet(f"""
-            color: {self.theme.colors.success};
-            font-weight: {self.theme.typography.medium};
-            background-color: {self.theme.colors.grey_50};
-            padding: 4px 8px;
-            border-radius: {self.theme.borderRadius.md};
-            border-left: 2px solid {self.theme.colors.success};
-        """)
+        self.status_label_style = None
+        self.set_status_style(self.styler.generate_status_label_style("ready"))
         status_layout.addWidget(self.status_label)
         status_layout.addStretch()
         
@@ -346,17 +472,18 @@ class GreenhouseDesktop(QMainWindow):
         control_layout.setSpacing(6)
         control_layout.setContentsMargins(10, 16, 10, 10)
         
+        # (text, backend command, parameters, row, col)
         buttons = [
-            ("🌡️ Temperature", 0, 0),
-            ("💧 Humidity", 0, 1),
-            ("📊 System Status", 1, 0),
-            ("📁 List Files", 1, 1),
-            ("📂 Current Path", 2, 0)
+            ("🌡️ Temperature", "read_sensor", {"sensor": "temperature"}, 0, 0),
+            ("💧 Humidity", "read_sensor", {"sensor": "humidity"}, 0, 1),
+            ("📊 System Status", "system_status", None, 1, 0),
+            ("📁 List Files", "list_directory", None, 1, 1),
+            ("📂 Current Path", "get_current_path", None, 2, 0)
         ]
         
-        for text, row, col in buttons:
+        for text, command, parameters, row, col in buttons:
             btn = QPushButton(text)
-            btn.clicked.connect(lambda checked, cmd="read_sensor": self.send_user_command(cmd))
+            btn.clicked.connect(partial(self.send_user_command, command, parameters))
             btn.setStyleSheet(self.styler.generate_button_style("primary"))
             btn.setMinimumHeight(32)
             control_layout.addWidget(btn, row, col)
@@ -368,9 +495,10 @@ class GreenhouseDesktop(QMainWindow):
         self.user_output.setReadOnly(True)
         self.user_output.setPlaceholderText("Command results will appear here...")
         self.user_output.setMinimumHeight(300)
+        self.user_output.document().setMaximumBlockCount(MAX_OUTPUT_BLOCKS)
         
         btn_clear_user = QPushButton("🗑️ Clear Output")
-        btn_clear_user.clicked.connect(self.user_output.clear)
+        btn_clear_user.clicked.connect(lambda: self.clear_output(self.user_output))
         btn_clear_user.setStyleSheet(self.styler.generate_button_style("secondary"))
         btn_clear_user.setMinimumHeight(28)
         
@@ -393,15 +521,7 @@ class GreenhouseDesktop(QMainWindow):
         path_layout.addWidget(path_label)
         
         self.path_label = QLabel("/")
-        self.path_label.setStyleSheet(f"""
-            font-family: {self.theme.typography.font_family_mono}; 
-            background-color: {self.theme.colors.grey_100}; 
-            padding: 4px 8px;
-            border-radius: {self.theme.borderRadius.md};
-            border: 1px solid {self.theme.colors.grey_300};
-            color: {self.theme.colors.text_primary};
-            font-weight: {self.theme.typography.medium};
-        """)
+        self.path_label.setStyleSheet(self.styler.generate_path_label_style())
         path_layout.addWidget(self.path_label)
         path_layout.addStretch()
         
@@ -453,9 +573,10 @@ class GreenhouseDesktop(QMainWindow):
         self.dev_output.setReadOnly(True)
         self.dev_output.setPlaceholderText("Terminal output will appear here...")
         self.dev_output.setMinimumHeight(300)
+        self.dev_output.document().setMaximumBlockCount(MAX_OUTPUT_BLOCKS)
         
         btn_clear_dev = QPushButton("🗑️ Clear Output")
-        btn_clear_dev.clicked.connect(self.dev_output.clear)
+        btn_clear_dev.clicked.connect(lambda: self.clear_output(self.dev_output))
         btn_clear_dev.setStyleSheet(self.styler.generate_button_style("secondary"))
         btn_clear_dev.setMinimumHeight(28)
         
@@ -547,7 +668,7 @@ class GreenhouseDesktop(QMainWindow):
         btn_clear_anomalies.setStyleSheet(self.styler.generate_button_style("secondary"))
         
         btn_refresh_anomalies = QPushButton("🔄 Refresh")
-        btn_refresh_anomalies.clicked.connect(self.update_anomalies_list)
+        btn_refresh_anomalies.clicked.connect(self.reload_anomalies_list)
         btn_refresh_anomalies.setStyleSheet(self.styler.generate_button_style("outline"))
         
         anomaly_controls_layout.addWidget(btn_clear_anomalies)
@@ -621,6 +742,7 @@ class GreenhouseDesktop(QMainWindow):
         self.server_info = QTextEdit()
         self.server_info.setReadOnly(True)
         self.server_info.setPlaceholderText("Server information will appear here...")
+        self.server_info.document().setMaximumBlockCount(MAX_OUTPUT_BLOCKS)
         
         refresh_layout = QHBoxLayout()
         self.auto_refresh = QCheckBox("🔄 Auto-refresh every 10 seconds")
@@ -629,7 +751,7 @@ class GreenhouseDesktop(QMainWindow):
         refresh_layout.addStretch()
         
         btn_clear_server = QPushButton("🗑️ Clear Output")
-        btn_clear_server.clicked.connect(self.server_info.clear)
+        btn_clear_server.clicked.connect(lambda: self.clear_output(self.server_info))
         refresh_layout.addWidget(btn_clear_server)
         
         info_layout.addWidget(self.server_info)
@@ -645,30 +767,54 @@ class GreenhouseDesktop(QMainWindow):
         return widget
 
     def update_devices_table(self):
-        """Update the edge devices table"""
+        """Update the edge devices table, touching only cells that changed"""
         devices = self.edge_aggregator.get_device_status()
-        self.devices_table.setRowCount(len(devices))
+        table = self.devices_table
+        seen = set()
         
-        for row, device in enumerate(devices):
-            self.devices_table.setItem(row, 0, QTableWidgetItem(device['device_id']))
-            self.devices_table.setItem(row, 1, QTableWidgetItem(device['type']))
-            self.devices_table.setItem(row, 2, QTableWidgetItem(device['location']))
+        for device in devices:
+            device_id = device['device_id']
+            seen.add(device_id)
+            cells = (
+                device_id,
+                device['type'],
+                device['location'],
+                device['status'],
+                f"{device['battery_level']:.1f}%",
+                device['last_seen']
+            )
+            previous = self.device_cells.get(device_id)
+            if previous == cells:
+                continue
             
-            # Status with color coding
-            status_item = QTableWidgetItem(device['status'])
-            if device['status'] == 'online':
-                status_item.setBackground(QColor(self.theme.colors.success))
-            elif device['status'] == 'offline':
-                status_item.setBackground(QColor(self.theme.colors.error))
+            if previous is None:
+                row = table.rowCount()
+                table.insertRow(row)
+                self.device_rows[device_id] = row
+                for col, text in enumerate(cells):
+                    table.setItem(row, col, QTableWidgetItem(text))
             else:
-                status_item.setBackground(QColor(self.theme.colors.warning))
-            self.devices_table.setItem(row, 3, status_item)
+                row = self.device_rows[device_id]
+                for col, (text, old_text) in enumerate(zip(cells, previous)):
+                    if text != old_text:
+                        table.item(row, col).setText(text)
             
-            # Battery level with progress bar
-            battery_item = QTableWidgetItem(f"{device['battery_level']:.1f}%")
-            self.devices_table.setItem(row, 4, battery_item)
+            # Status with color coding
+            if previous is None or previous[3] != cells[3]:
+                color = self.status_colors.get(device['status'], self.status_colors['unknown'])
+                table.item(row, 3).setBackground(color)
             
-            self.devices_table.setItem(row, 5, QTableWidgetItem(device['last_seen']))
+            self.device_cells[device_id] = cells
+        
+        # Drop rows for devices the aggregator no longer reports
+        stale = [device_id for device_id in self.device_rows if device_id not in seen]
+        if stale:
+            for row in sorted((self.device_rows.pop(device_id) for device_id in stale), reverse=True):
+                table.removeRow(row)
+            for device_id in stale:
+                del self.device_cells[device_id]
+            for row in range(table.rowCount()):
+                self.device_rows[table.item(row, 0).text()] = row
     
     def update_edge_metrics_display(self):
         """Update the aggregated metrics display"""
@@ -677,43 +823,54 @@ class GreenhouseDesktop(QMainWindow):
         
         metrics = self.edge_aggregator.get_aggregated_metrics(sensor_type)
         
-        self.edge_metrics_display.clear()
-        self.edge_metrics_display.append(f"=== Aggregated Metrics: {sensor_type_str} ===\n")
+        # Build the whole report and set it in one go; one append per line
+        # would relayout the document for every line
+        lines = [f"=== Aggregated Metrics: {sensor_type_str} ===", ""]
         
         for location, sensor_data in metrics.items():
             if sensor_type_str in sensor_data:
-                self.edge_metrics_display.append(f"📍 Location: {location}")
+                lines.append(f"📍 Location: {location}")
                 
                 for timeframe, data in sensor_data[sensor_type_str].items():
-                    self.edge_metrics_display.append(
+                    lines.append(
                         f"  {timeframe}: {data['average']:.2f} "
                         f"(min: {data['min']:.2f}, max: {data['max']:.2f}) "
                         f"[{data['count']} samples, quality: {data['quality_score']:.2f}]"
                     )
                 
-                self.edge_metrics_display.append("")
+                lines.append("")
         
         if not metrics:
-            self.edge_metrics_display.append("No data available for selected sensor type.")
+            lines.append("No data available for selected sensor type.")
+        
+        self.edge_metrics_display.setPlainText("\n".join(lines))
     
     def update_anomalies_list(self):
-        """Update the anomalies list"""
-        anomalies = self.edge_aggregator.get_recent_anomalies(20)
-        self.anomalies_list.clear()
+        """Add anomalies detected since the last update to the top of the list"""
+        self.anomalies_seen, anomalies = self.edge_aggregator.get_anomalies_since(
+            self.anomalies_seen, ANOMALY_LIST_SIZE)
         
-        for anomaly in anomalies:
+        # Newest first from the aggregator; insert oldest first so the
+        # newest ends up on top
+        for anomaly in reversed(anomalies):
             item_text = f"[{anomaly['timestamp'][11:19]}] {anomaly['severity'].upper()}: {anomaly['message']}"
             item = QListWidgetItem(item_text)
             
             # Color code by severity
-            if anomaly['severity'] == 'critical':
-                item.setBackground(QColor(self.theme.colors.error))
-            elif anomaly['severity'] == 'warning':
-                item.setBackground(QColor(self.theme.colors.warning))
-            elif anomaly['severity'] == 'info':
-                item.setBackground(QColor(self.theme.colors.info))
+            color = self.severity_colors.get(anomaly['severity'])
+            if color is not None:
+                item.setBackground(color)
             
-            self.anomalies_list.addItem(item)
+            self.anomalies_list.insertItem(0, item)
+        
+        while self.anomalies_list.count() > ANOMALY_LIST_SIZE:
+            self.anomalies_list.takeItem(self.anomalies_list.count() - 1)
+    
+    def reload_anomalies_list(self):
+        """Rebuild the anomalies list from the aggregator's recent history"""
+        self.anomalies_list.clear()
+        self.anomalies_seen = 0
+        self.update_anomalies_list()
     
     def clear_anomalies(self):
         """Clear all anomalies"""
@@ -722,12 +879,9 @@ class GreenhouseDesktop(QMainWindow):
     
     def add_demo_device(self):
         """Add a new demo edge device"""
-        device_id = f"demo_sensor_{uuid.uuid4().hex[:8]}"
-        locations = ['north_wing', 'south_wing', 'herb_garden', 'tropical_zone', 'seedling_area']
-        sensor_types = list(SensorType)
-        
-        location = random.choice(locations)
-        capabilities = random.sample(sensor_types, random.randint(1, 3))
+        device_id = f"demo_sensor_{secrets.token_hex(4)}"
+        location = self.rng.choice(DEMO_LOCATIONS)
+        capabilities = self.rng.sample(DEMO_CAPABILITIES, self.rng.randint(1, 3))
         
         self.edge_aggregator.register_edge_device(
             device_id,
@@ -741,9 +895,7 @@ class GreenhouseDesktop(QMainWindow):
 
     def list_log_files(self):
         """List all session log files"""
-        result = self.make_server_request('/logs')
-        if result:
-            self.display_formatted_json("Session Log Files", result)
+        self.make_server_request('/logs', lambda result: self.display_formatted_json("Session Log Files", result))
 
     def view_session_log(self):
         """View specific session log"""
@@ -752,101 +904,132 @@ class GreenhouseDesktop(QMainWindow):
             self.show_error("Session ID Required", "Please enter a session ID")
             return
         
-        result = self.make_server_request(f'/sessions/{session_id}/log')
-        if result:
-            self.server_info.append(f"=== Session Log: {result.get('sessionId', 'Unknown')} ===\n")
-            self.server_info.append(f"Session Number: {result.get('sessionNumber', 'Unknown')}\n")
-            self.server_info.append(f"Log File: {result.get('logFile', 'Unknown')}\n")
-            self.server_info.append("=" * 50 + "\n")
-            self.server_info.append(result.get('content', 'No log content available'))
-            self.server_info.append("\n" + "=" * 50 + "\n")
+        self.make_server_request(f'/sessions/{session_id}/log', self.display_session_log)
+        
+    def display_session_log(self, result):
+        """Show a session log fetched by view_session_log"""
+        self._log(self.server_info, f"=== Session Log: {result.get('sessionId', 'Unknown')} ===\n")
+        self._log(self.server_info, f"Session Number: {result.get('sessionNumber', 'Unknown')}\n")
+        self._log(self.server_info, f"Log File: {result.get('logFile', 'Unknown')}\n")
+        self._log(self.server_info, "=" * 50 + "\n")
+        self._log(self.server_info, result.get('content', 'No log content available'))
+        self._log(self.server_info, "\n" + "=" * 50 + "\n")
         
     def toggle_auto_refresh(self, enabled):
         if enabled:
             self.auto_refresh_timer.start(10000)  # 10 seconds
-            self.server_info.append(f"[{QDateTime.currentDateTime().toString('hh:mm:ss')}] Auto-refresh enabled")
+            self._log(self.server_info, f"[{self.clock()}] Auto-refresh enabled")
         else:
             self.auto_refresh_timer.stop()
-            self.server_info.append(f"[{QDateTime.currentDateTime().toString('hh:mm:ss')}] Auto-refresh disabled")
+            self._log(self.server_info, f"[{self.clock()}] Auto-refresh disabled")
         
     def refresh_all_status(self):
-        """Refresh all server status information"""
-        self.check_server_health()
-        self.view_server_stats()
-        self.list_sessions()
+        """Refresh all server status information with a single /status call"""
+        self.make_server_request('/status', self.display_status)
+        
+    def display_status(self, result):
+        """Show the health, stats and sessions sections of a /status reply"""
+        for key, title in STATUS_SECTIONS:
+            if key in result:
+                self.display_formatted_json(title, result[key])
+        
+    def make_server_request(self, endpoint, callback, method='GET', data=None):
+        """Send an HTTP request to the backend; callback gets the parsed JSON on success
+        
+        Returns immediately: QNetworkAccessManager does the network I/O off
+        the GUI thread and handle_server_reply runs when the reply finishes,
+        so several calls (e.g. refresh_all_status) are in flight at once.
+        """
+        url = f"{self.backend_url}{endpoint}"
+        self._log(self.server_info, f"[{self.clock()}] {method} {endpoint}")
+        
+        request = QNetworkRequest(QUrl(url))
+        request.setTransferTimeout(5000)
+        request.setRawHeader(b"Accept", b"application/json")
+        # Offer HTTP/2 (negotiated via ALPN) when BACKEND_URL is https, e.g.
+        # behind a TLS proxy; plain http:// to Express stays on HTTP/1.1
+        request.setAttribute(QNetworkRequest.Http2AllowedAttribute, True)
+        
+        if method == 'GET':
+            reply = self.nam.get(request)
+        elif method == 'DELETE':
+            reply = self.nam.deleteResource(request)
+        elif method == 'POST':
+            request.setHeader(QNetworkRequest.ContentTypeHeader, "application/json")
+            reply = self.nam.post(request, QByteArray(orjson.dumps(data)))
+        else:
+            self._log(self.server_info, f"Error: Unsupported method: {method}\n")
+            return
         
-    def make_server_request(self, endpoint, method='GET', data=None):
-        """Make HTTP request to backend server"""
+        reply.finished.connect(lambda: self.handle_server_reply(reply, callback))
+        
+    def handle_server_reply(self, reply, callback):
+        """Turn a finished backend reply into a callback or an error line"""
         try:
-            url = f"{self.backend_url}{endpoint}"
-            self.server_info.append(f"[{QDateTime.currentDateTime().toString('hh:mm:ss')}] {method} {endpoint}")
-            
-            if method == 'GET':
-                response = requests.get(url, timeout=5)
-            elif method == 'DELETE':
-                response = requests.delete(url, timeout=5)
-            elif method == 'POST':
-                response = requests.post(url, json=data, timeout=5)
-            else:
-                raise ValueError(f"Unsupported method: {method}")
+            status = reply.attribute(QNetworkRequest.HttpStatusCodeAttribute)
+            body = bytes(reply.readAll())
             
-            if response.status_code == 200:
-                return response.json()
+            if status == 200:
+                result = orjson.loads(body)
+                if result:
+                    callback(result)
+            elif status is not None:
+                self._log(self.server_info, f"Error: {status} - {body.decode(errors='replace')}\n")
+            elif reply.error() in (QNetworkReply.OperationCanceledError, QNetworkReply.TimeoutError):
+                self._log(self.server_info, "Error: Request timeout - server is not responding\n")
+            elif reply.error() in (QNetworkReply.ConnectionRefusedError, QNetworkReply.HostNotFoundError):
+                self._log(self.server_info, f"Error: Cannot connect to backend server at {self.backend_url}. Make sure it's running.\n")
             else:
-                self.server_info.append(f"Error: {response.status_code} - {response.text}\n")
-                return None
+                self._log(self.server_info, f"Error: {reply.errorString()}\n")
                 
-        except requests.exceptions.ConnectionError:
-            self.server_info.append(f"Error: Cannot connect to backend server at {self.backend_url}. Make sure it's running.\n")
-            return None
-        except requests.exceptions.Timeout:
-            self.server_info.append("Error: Request timeout - server is not responding\n")
-            return None
         except Exception as e:
-            self.server_info.append(f"Error: {str(e)}\n")
-            return None
+            self._log(self.server_info, f"Error: {str(e)}\n")
+        finally:
+            reply.deleteLater()
         
     def check_server_health(self):
         """Check server health status"""
-        result = self.make_server_request('/health')
-        if result:
-            self.display_formatted_json("Server Health", result)
+        self.make_server_request('/health', lambda result: self.display_formatted_json("Server Health", result))
         
     def view_server_stats(self):
         """View server statistics"""
-        result = self.make_server_request('/stats')
-        if result:
-            self.display_formatted_json("Server Statistics", result)
+        self.make_server_request('/stats', lambda result: self.display_formatted_json("Server Statistics", result))
         
     def list_sessions(self):
         """List active sessions"""
-        result = self.make_server_request('/sessions')
-        if result:
-            self.display_formatted_json("Active Sessions", result)
+        self.make_server_request('/sessions', lambda result: self.display_formatted_json("Active Sessions", result))
         
     def list_cache_keys(self):
         """List cache keys"""
-        result = self.make_server_request('/cache/keys')
-        if result:
-            self.display_formatted_json("Cache Keys", result)
+        self.make_server_request('/cache/keys', lambda result: self.display_formatted_json("Cache Keys", result))
         
     def clear_all_cache(self):
-        """Clear all cache"""
-        reply = QMessageBox.question(self, 'Clear Cache', 
-                                   'Are you sure you want to clear ALL cache?',
-                                   QMessageBox.Yes | QMessageBox.No,
-                                   QMessageBox.No)
-        
+        """Clear all cache, once the user confirms
+        
+        The confirmation is opened window-modal without a nested event loop;
+        the request is sent from on_clear_cache_confirm.
+        """
+        if self.clear_cache_box is None:
+            self.clear_cache_box = QMessageBox(self)
+            self.clear_cache_box.setIcon(QMessageBox.Question)
+            self.clear_cache_box.setWindowTitle('Clear Cache')
+            self.clear_cache_box.setText('Are you sure you want to clear ALL cache?')
+            self.clear_cache_box.setStandardButtons(QMessageBox.Yes | QMessageBox.No)
+            self.clear_cache_box.finished.connect(self.on_clear_cache_confirm)
+        
+        # A second click while the question is up doesn't ask again
+        if not self.clear_cache_box.isVisible():
+            self.clear_cache_box.setDefaultButton(QMessageBox.No)
+            self.clear_cache_box.open()
+        
+    def on_clear_cache_confirm(self, reply):
         if reply == QMessageBox.Yes:
-            result = self.make_server_request('/cache/clear', method='DELETE')
-            if result:
-                self.display_formatted_json("Cache Clear Result", result)
+            self.make_server_request('/cache/clear', lambda result: self.display_formatted_json("Cache Clear Result", result),
+                                     method='DELETE')
         
     def check_queues(self):
         """Check RabbitMQ queue status"""
-        result = self.make_server_request('/queues')
-        if result:
-            self.display_formatted_json("Queue Status", result)
+        self.make_server_request('/queues', lambda result: self.display_formatted_json("Queue Status", result))
         
     def test_server_command(self):
         """Test server command execution"""
@@ -854,15 +1037,14 @@ class GreenhouseDesktop(QMainWindow):
             "command": "read_sensor",
             "parameters": {}
         }
-        result = self.make_server_request('/command', method='POST', data=command_data)
-        if result:
-            self.display_formatted_json("Test Command Result", result)
+        self.make_server_request('/command', lambda result: self.display_formatted_json("Test Command Result", result),
+                                 method='POST', data=command_data)
         
     def display_formatted_json(self, title, data):
         """Display formatted JSON in server info panel"""
-        self.server_info.append(f"=== {title} ===")
-        self.server_info.append(json.dumps(data, indent=2))
-        self.server_info.append("=" * 50 + "\n")
+        self._log(self.server_info, f"=== {title} ===")
+        self._log(self.server_info, orjson.dumps(data, option=orjson.OPT_INDENT_2).decode())
+        self._log(self.server_info, "=" * 50 + "\n")
         
     def setup_command_worker(self):
         self.logger.info("Setting up command worker")
@@ -871,47 +1053,24 @@ class GreenhouseDesktop(QMainWindow):
         self.command_worker.connection_status.connect(self.update_connection_status)
         self.command_worker.error_occurred.connect(self.handle_error)
         
-        # Initial connection
+        # Initial connection; after a drop or failed attempt the worker
+        # reschedules itself with backoff, so there is nothing to poll
         self.command_worker.setup_rabbitmq()
         
-        # Setup connection check timer
-        self.connection_timer = QTimer()
-        self.connection_timer.timeout.connect(self.check_connection)
-        self.connection_timer.start(10000)
-        
     def update_connection_status(self, connected):
+        # Repeated reports of the same state don't need a repolish
+        if connected == self.rabbitmq_connected:
+            return
         self.rabbitmq_connected = connected
         if connected:
             self.connection_status.setText("✅ Connected to RabbitMQ")
-            self.connection_status.setStyleSheet(f"""
-                color: {self.theme.colors.success}; 
-                font-weight: {self.theme.typography.medium};
-                background-color: {self.theme.colors.grey_100};
-                padding: 2px 6px;
-                border-radius: {self.theme.borderRadius.sm};
-                border: 1px solid {self.theme.colors.grey_300};
-                border-left: 2px solid {self.theme.colors.success};
-            """)
         else:
             self.connection_status.setText("❌ Disconnected from RabbitMQ")
-            self.connection_status.setStyleSheet(f"""
-                color: {self.theme.colors.error}; 
-                font-weight: {self.theme.typography.medium};
-                background-color: {self.theme.colors.grey_100};
-                padding: 2px 6px;
-                border-radius: {self.theme.borderRadius.sm};
-                border: 1px solid {self.theme.colors.grey_300};
-                border-left: 2px solid {self.theme.colors.error};
-            """)
-        
-    def check_connection(self):
-        if not self.rabbitmq_connected:
-            self.logger.info("Attempting to reconnect to RabbitMQ...")
-            self.command_worker.setup_rabbitmq()
+        self.connection_status.setStyleSheet(self.connection_styles[connected])
         
     def send_user_command(self, command, parameters=None):
         """Send a user command with automatic retry"""
-        command_id = str(uuid.uuid4())
+        command_id = self.next_command_id()
         command_data = {
             'commandId': command_id,
             'command': command,
@@ -926,28 +1085,24 @@ class GreenhouseDesktop(QMainWindow):
             "parameters": parameters or {}
         }
         
-        self.logger.info(f"Sending user command {command_id}: {command}")
-        
-        import time
-        time.sleep(0.1)
+        self.logger.info("Sending user command %s: %s", command_id, command)
         
         if self.command_worker.send_command(command_data):
-            timestamp = QDateTime.currentDateTime().toString("hh:mm:ss")
-            self.user_output.append(f"[{timestamp}] Sent: {command}")
+            timestamp = self.clock()
+            self._log(self.user_output, f"[{timestamp}] Sent: {command}")
             return True
         else:
             self.logger.warning("First send attempt failed, attempting reconnect...")
             if self.command_worker.attempt_reconnect():
-                time.sleep(0.1)
                 if self.command_worker.send_command(command_data):
                     self.logger.info("Command sent successfully after reconnect")
-                    timestamp = QDateTime.currentDateTime().toString("hh:mm:ss")
-                    self.user_output.append(f"[{timestamp}] Sent: {command} [after reconnect]")
+                    timestamp = self.clock()
+                    self._log(self.user_output, f"[{timestamp}] Sent: {command} [after reconnect]")
                     return True
             
             self.logger.error("Failed to send command after retry")
-            timestamp = QDateTime.currentDateTime().toString("hh:mm:ss")
-            self.user_output.append(f"[{timestamp}] Failed to send: {command}")
+            timestamp = self.clock()
+            self._log(self.user_output, f"[{timestamp}] Failed to send: {command}")
             return False
         
     def send_developer_command(self, command_text=None):
@@ -961,7 +1116,7 @@ class GreenhouseDesktop(QMainWindow):
             self.show_error("Not connected to RabbitMQ", "Please check if RabbitMQ server is running")
             return
             
-        if hasattr(self, 'command_input') and self.command_input.text().strip() == command_text:
+        if self.command_input.text().strip() == command_text:
             self.command_input.clear()
         
         if command_text.startswith('cd '):
@@ -972,7 +1127,7 @@ class GreenhouseDesktop(QMainWindow):
             command = "execute_raw"
             parameters = {"raw_command": command_text}
         
-        command_id = str(uuid.uuid4())
+        command_id = self.next_command_id()
         command_data = {
             "commandId": command_id,
             "command": command,
@@ -980,7 +1135,7 @@ class GreenhouseDesktop(QMainWindow):
             "parameters": parameters,
             "sessionId": self.session_id,
             "raw_command": command_text,
-            "timestamp": QDateTime.currentDateTime().toString(Qt.ISODate)
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S")
         }
         
         self.pending_commands[command_id] = {
@@ -990,24 +1145,23 @@ class GreenhouseDesktop(QMainWindow):
         }
         
         success = self.command_worker.send_command(command_data)
-        timestamp = QDateTime.currentDateTime().toString("hh:mm:ss")
+        timestamp = self.clock()
         if success:
-            self.dev_output.append(f"[{timestamp}] $ {command_text}")
+            self._log(self.dev_output, f"[{timestamp}] $ {command_text}")
             self.status_label.setText(f"Sent: {command_text}")
-            self.logger.info(f"Developer command {command_id} sent: {command_text}")
+            self.logger.info("Developer command %s sent: %s", command_id, command_text)
         else:
-            self.dev_output.append(f"[{timestamp}] $ {command_text} [FAILED TO SEND]")
+            self._log(self.dev_output, f"[{timestamp}] $ {command_text} [FAILED TO SEND]")
             self.status_label.setText(f"Failed to send: {command_text}")
-            self.logger.error(f"Failed to send developer command {command_id}: {command_text}")
+            self.logger.error("Failed to send developer command %s: %s", command_id, command_text)
         
     def cancel_last_command(self):
         if self.pending_commands:
-            last_id = list(self.pending_commands.keys())[-1]
-            last_command = self.pending_commands[last_id]
-            del self.pending_commands[last_id]
+            # dicts keep insertion order, so popitem() removes the newest
+            _, last_command = self.pending_commands.popitem()
             self.status_label.setText(f"Cancelled: {last_command.get('command', 'last command')}")
-            self.dev_output.append(f"[{QDateTime.currentDateTime().toString('hh:mm:ss')}] Command cancelled: {last_command.get('command', 'last command')}")
-            self.logger.info(f"Cancelled command: {last_command.get('command', 'last command')}")
+            self._log(self.dev_output, f"[{self.clock()}] Command cancelled: {last_command.get('command', 'last command')}")
+            self.logger.info("Cancelled command: %s", last_command.get('command', 'last command'))
             
     def handle_response(self, response):
         command_id = response.get('commandId')
@@ -1017,80 +1171,106 @@ class GreenhouseDesktop(QMainWindow):
         session_id = response.get('sessionId')
         current_path = response.get('currentPath')
         
-        self.logger.info(f"Received response for command {command_id}, cached: {cached}, error: {bool(error)}")
+        self.logger.info("Received response for command %s, cached: %s, error: %s", command_id, cached, bool(error))
         
         # DEBUG: Log pending commands
-        self.logger.info(f"Pending commands: {list(self.pending_commands.keys())}")
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("Pending commands: %s", list(self.pending_commands))
         
-        timestamp = QDateTime.currentDateTime().toString("hh:mm:ss")
+        timestamp = self.clock()
         
         if command_id in self.pending_commands:
             command_info = self.pending_commands[command_id]
-            self.logger.info(f"Found command info: type={command_info.get('type')}, command={command_info.get('command')}")
+            self.logger.info("Found command info: type=%s, command=%s", command_info.get('type'), command_info.get('command'))
             
             # Update current path if provided
             if current_path:
                 self.current_path = current_path
                 self.path_label.setText(self.current_path)
-                self.logger.info(f"Current path updated to: {self.current_path}")
+                self.logger.info("Current path updated to: %s", self.current_path)
             
             if error:
                 output_text = f"ERROR: {error}"
-                self.logger.error(f"Command {command_id} failed: {error}")
-            else:
-                if isinstance(result, dict):
-                    if 'output' in result:
-                        output_text = result['output']
-                    elif 'newPath' in result:
-                        output_text = result['output'] if 'output' in result else f"Changed to: {result['newPath']}"
-                    else:
-                        output_text = json.dumps(result, indent=2)
+                self.logger.error("Command %s failed: %s", command_id, error)
+            elif isinstance(result, dict):
+                for key, formatter in RESULT_FORMATTERS:
+                    if key in result:
+                        output_text = formatter(result)
+                        break
                 else:
-                    output_text = str(result)
+                    output_text = orjson.dumps(result, option=orjson.OPT_INDENT_2).decode()
+            else:
+                output_text = str(result)
             
             cache_indicator = " [CACHED]" if cached else ""
             session_indicator = f" [Session: {session_id[:8]}...]" if session_id else ""
             
             if command_info['type'] == 'user':
-                self.logger.info(f"Appending to USER output: {output_text[:100]}...")
-                self.user_output.append(f"[{timestamp}] Result{cache_indicator}{session_indicator}:\n{output_text}\n{'-'*50}")
+                self.logger.info("Appending to USER output: %.100s...", output_text)
+                self._log(self.user_output, f"[{timestamp}] Result{cache_indicator}{session_indicator}:\n{output_text}\n{'-'*50}")
             else:
-                self.logger.info(f"Appending to DEV output: {output_text[:100]}...")
-                self.dev_output.append(f"[{timestamp}] Result{cache_indicator}{session_indicator}:\n{output_text}\n{'-'*50}")
+                self.logger.info("Appending to DEV output: %.100s...", output_text)
+                self._log(self.dev_output, f"[{timestamp}] Result{cache_indicator}{session_indicator}:\n{output_text}\n{'-'*50}")
                 
             del self.pending_commands[command_id]
             
         else:
-            self.logger.warning(f"Command ID {command_id} not found in pending_commands!")
+            self.logger.warning("Command ID %s not found in pending_commands!", command_id)
             # Fallback: try to display anyway
             if error:
                 output_text = f"ERROR: {error}"
             else:
                 output_text = str(result)
             
-            self.user_output.append(f"[{timestamp}] [UNKNOWN COMMAND] Result:\n{output_text}\n{'-'*50}")
+            self._log(self.user_output, f"[{timestamp}] [UNKNOWN COMMAND] Result:\n{output_text}\n{'-'*50}")
             
         status_suffix = " (cached)" if cached else ""
         if error:
             self.status_label.setText(f"❌ Command failed{status_suffix}")
-            self.status_label.setStyleSheet(f"""
-                color: {self.theme.colors.error};
-                font-weight: {self.theme.typography.medium};
-                background-color: {self.theme.colors.grey_50};
-                padding: 6px 12px;
-                border-radius: {self.theme.borderRadius.md};
-                border-left: 3px solid {self.theme.colors.error};
-            """)
+            self.set_status_style(self.styler.styles["status_label:error"])
         else:
             self.status_label.setText(f"✅ Command completed{status_suffix}")
-            self.status_label.setStyleSheet(f"""
-                color: {self.theme.colors.success};
-                font-weight: {self.theme.typography.medium};
-                background-color: {self.theme.colors.grey_50};
-                padding: 6px 12px;
-                border-radius: {self.theme.borderRadius.md};
-                border-left: 3px solid {self.theme.colors.success};
-            """)
+            self.set_status_style(self.styler.styles["status_label:success"])
+
+    def next_command_id(self):
+        """Next correlation id for an outgoing command"""
+        return f"{self.command_id_prefix}-{next(self.command_counter):x}"
+
+    def clock(self):
+        """Current hh:mm:ss, reformatted only when the second changes"""
+        second = int(time.time())
+        if second != self.clock_cache[0]:
+            self.clock_cache = (second, time.strftime("%H:%M:%S", time.localtime(second)))
+        return self.clock_cache[1]
+
+    def _log(self, edit, line):
+        """Queue a line for a text edit; queued lines are appended together"""
+        buffer = self.log_buffers.get(edit)
+        if buffer is None:
+            buffer = self.log_buffers[edit] = deque()
+        buffer.append(line)
+        if not self.log_flush_timer.isActive():
+            self.log_flush_timer.start()
+
+    def flush_logs(self):
+        """Append every queued line with one append per text edit"""
+        for edit, lines in self.log_buffers.items():
+            if lines:
+                # Repaint once after the append rather than during it
+                edit.setUpdatesEnabled(False)
+                edit.append("\n".join(lines))
+                edit.setUpdatesEnabled(True)
+                lines.clear()
+
+    def clear_output(self, edit):
+        self.log_buffers.pop(edit, None)
+        edit.clear()
+
+    def set_status_style(self, style):
+        """Apply a cached status line style unless it is already applied"""
+        if style is not self.status_label_style:
+            self.status_label_style = style
+            self.status_label.setStyleSheet(style)
 
     def handle_error(self, error_message):
         self.logger.error(f"Command worker error: {error_message}")
@@ -1098,20 +1278,25 @@ class GreenhouseDesktop(QMainWindow):
 
     def show_error(self, title, message):
         self.logger.warning(f"Showing error dialog: {title} - {message}")
-        msg = QMessageBox()
-        msg.setIcon(QMessageBox.Critical)
-        msg.setWindowTitle(title)
-        msg.setText(message)
-        msg.exec_()
+        if self.error_box is None:
+            self.error_box = QMessageBox(self)
+            self.error_box.setIcon(QMessageBox.Critical)
+            self.error_box.setModal(False)
+        
+        # Non-modal, so no nested event loop; while it is open, newer errors
+        # just replace its text
+        self.error_box.setWindowTitle(title)
+        self.error_box.setText(message)
+        self.error_box.show()
+        self.error_box.raise_()
 
     def closeEvent(self, event):
         self.logger.info("Application shutting down")
         if self.command_worker:
             self.command_worker.disconnect()
-        if self.auto_refresh_timer.isActive():
-            self.auto_refresh_timer.stop()
-        if self.demo_data_timer.isActive():
-            self.demo_data_timer.stop()
+        self.auto_refresh_timer.stop()  # no-op if it isn't running
+        # Also stops the demo feed, which runs on the aggregator thread
+        self.edge_aggregator.shutdown()
         event.accept()
 
 
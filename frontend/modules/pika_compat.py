@@ -0,0 +1,34 @@
+import pika
+
+# The helpers below reach into pika's private BlockingConnection/BlockingChannel
+# internals; checked against the pika pinned in requirements.txt
+SUPPORTED_PIKA_MAJOR = 1
+
+def _require(obj, attr, what):
+    """Return obj.attr, or raise naming the pika internals that are missing"""
+    value = getattr(obj, attr, None)
+    if int(pika.__version__.split('.')[0]) != SUPPORTED_PIKA_MAJOR or value is None:
+        raise RuntimeError(
+            f"{what} needs pika {SUPPORTED_PIKA_MAJOR}.x internals ({attr}); "
+            f"found pika {pika.__version__}"
+        )
+    return value
+
+def enable_async_confirms(channel, on_confirm):
+    """Put a BlockingChannel in publisher confirm mode without per-publish waits
+
+    BlockingChannel.confirm_delivery() makes every basic_publish block until
+    the broker acks it. Enabling confirms on the underlying channel instead
+    leaves basic_publish non-blocking (the blocking wrapper does not know
+    confirms are on), and on_confirm(method_frame) gets each Basic.Ack /
+    Basic.Nack, possibly with multiple=True, as connection events are processed.
+    """
+    impl = _require(channel, '_impl', "Asynchronous publisher confirms")
+    _require(impl, 'confirm_delivery', "Asynchronous publisher confirms")
+    impl.confirm_delivery(ack_nack_callback=on_confirm)
+
+def connection_socket(connection):
+    """The socket under a BlockingConnection, e.g. for a QSocketNotifier"""
+    impl = _require(connection, '_impl', "Watching the connection socket")
+    transport = _require(impl, '_transport', "Watching the connection socket")
+    return _require(transport, '_sock', "Watching the connection socket")
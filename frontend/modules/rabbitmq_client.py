@@ -1,14 +1,37 @@
 import pika
-import json
+import orjson
 import logging
 import os
-from PyQt5.QtCore import QObject, pyqtSignal, QTimer, QMutex, QMutexLocker
+import secrets
+from collections import deque
+from PyQt5.QtCore import QObject, QThread, Qt, QMetaObject, pyqtSignal, pyqtSlot, QTimer
+
+from modules.pika_compat import enable_async_confirms
 
 class RabbitMQClient(QObject):
-    """Thread-safe RabbitMQ client using QTimer for event processing"""
+    """Thread-safe RabbitMQ client using QTimer for event processing
+    
+    The pika connection is owned by the client's own QThread: connecting,
+    consuming, publishing and event processing all run there. The public
+    methods only queue a request for that thread, so callers never wait on
+    broker I/O; results and messages reach GUI slots as queued signals.
+    
+    Delivery is at-least-once: messages the broker had not confirmed when a
+    connection dropped are published again on the next one, so consumers
+    may see them twice. Every copy carries the same AMQP message_id for
+    the consumer to drop duplicates by.
+    """
     
     connection_status_changed = pyqtSignal(bool)
-    message_received = pyqtSignal(dict)
+    # Every message decoded in one event pump, as a list, oldest first.
+    # object, not list: a list signature copies it into a QVariantList
+    messages_received = pyqtSignal(object)
+    # Requests for the worker thread, emitted by the public methods
+    connect_requested = pyqtSignal()
+    disconnect_requested = pyqtSignal()
+    consume_requested = pyqtSignal()
+    prefetch_requested = pyqtSignal(int)
+    publish_requested = pyqtSignal()
     
     def __init__(self):
         super().__init__()
@@ -18,142 +41,283 @@ class RabbitMQClient(QObject):
         self.port = int(os.getenv('RABBITMQ_PORT', '5672'))
         self.username = os.getenv('RABBITMQ_USER', 'guest')
         self.password = os.getenv('RABBITMQ_PASS', 'guest')
+        # Responses the broker may push before we ack them; small keeps single
+        # responses snappy, larger suits bulk consumers. See set_prefetch
+        self.prefetch = int(os.getenv('RABBITMQ_PREFETCH', '16'))
         
         self.connection = None
         self.channel = None
         self.is_connected = False
-        self.mutex = QMutex()
         
         self.command_queue = 'greenhouse_commands'
         self.response_queue = 'command_responses'
         
-        self.pending_messages = []
+        # (queue_name, message, message_id) waiting to be published by the worker
+        self.outbox = deque()
+        # Publisher confirms arrive asynchronously; publish sequence number ->
+        # (queue_name, message, message_id) until the broker acks it
+        self.publish_seq = 0
+        self.unconfirmed = {}
         self.consuming = False
+        self.consumer_tag = None
+        # Messages decoded during the current pump and the last delivery tag
+        # to ack once they have been handed over
+        self.inbox = []
+        self.last_ack_tag = None
+        # Durable queues outlive our connections; declared once per client
+        self.queues_declared = False
         
         # Setup periodic timer for connection maintenance
-        self.maintenance_timer = QTimer()
+        self.maintenance_timer = QTimer(self)
         self.maintenance_timer.timeout.connect(self._process_events)
-        self.maintenance_timer.start(100)  # Process every 100ms
+        self.maintenance_timer.setInterval(100)  # Process every 100ms
+        self.connect_requested.connect(self._connect)
+        self.disconnect_requested.connect(self._disconnect)
+        self.consume_requested.connect(self._start_consuming)
+        self.prefetch_requested.connect(self._set_prefetch)
+        self.publish_requested.connect(self._process_events)
+        
+        # Move to a worker thread; the timer is parented to self so it follows
+        self.worker_thread = QThread()
+        self.moveToThread(self.worker_thread)
+        self.worker_thread.started.connect(self.maintenance_timer.start)
+        self.worker_thread.finished.connect(self.maintenance_timer.stop, Qt.DirectConnection)
+        self.worker_thread.start()
         
         self.logger = logging.getLogger('RabbitMQClient')
         self.logger.info(f"Initializing RabbitMQ client for {self.host}:{self.port}")
         
     def connect(self):
-        """Establish connection to RabbitMQ server"""
-        with QMutexLocker(self.mutex):
-            try:
-                if self.connection and not self.connection.is_closed:
-                    self.connection.close()
-                
-                credentials = pika.PlainCredentials(self.username, self.password)
-                parameters = pika.ConnectionParameters(
-                    host=self.host,
-                    port=self.port,
-                    credentials=credentials,
-                    heartbeat=600,
-                    blocked_connection_timeout=300,
-                    # Add these parameters for better Docker compatibility
-                    socket_timeout=5,
-                    retry_delay=5,
-                    connection_attempts=3
-                )
-                
-                self.connection = pika.BlockingConnection(parameters)
-                self.channel = self.connection.channel()
-                
-                # Declare queues
+        """Establish connection to RabbitMQ server
+        
+        Runs on the worker thread; the outcome is reported through
+        connection_status_changed.
+        """
+        self.connect_requested.emit()
+    
+    @pyqtSlot()
+    def _connect(self):
+        """Connect on the worker thread, replacing any existing connection"""
+        try:
+            if self.connection and not self.connection.is_closed:
+                self.connection.close()
+            self.consumer_tag = None
+            # Unacked deliveries are redelivered on the new channel
+            self.inbox = []
+            self.last_ack_tag = None
+            
+            credentials = pika.PlainCredentials(self.username, self.password)
+            parameters = pika.ConnectionParameters(
+                host=self.host,
+                port=self.port,
+                credentials=credentials,
+                heartbeat=600,
+                blocked_connection_timeout=300,
+                # Add these parameters for better Docker compatibility
+                socket_timeout=5,
+                retry_delay=5,
+                connection_attempts=3
+            )
+            
+            self.connection = pika.BlockingConnection(parameters)
+            self.channel = self.connection.channel()
+            
+            # Declare queues on the first connection only; reconnects
+            # reuse them instead of paying two round-trips each time
+            if not self.queues_declared:
                 self.channel.queue_declare(queue=self.command_queue, durable=True)
                 self.channel.queue_declare(queue=self.response_queue, durable=True)
-                
-                self.is_connected = True
-                self.logger.info(f"Successfully connected to RabbitMQ at {self.host}:{self.port}")
-                self.connection_status_changed.emit(True)
-                return True
-                
-            except Exception as e:
-                self.logger.error(f"Failed to connect to RabbitMQ at {self.host}:{self.port}: {e}")
-                self.is_connected = False
-                self.connection_status_changed.emit(False)
-                return False
+                self.queues_declared = True
+            
+            # Set QoS (must precede basic_consume to apply to the consumer)
+            self.channel.basic_qos(prefetch_count=self.prefetch)
+            
+            # Publisher confirms without a per-publish wait: acks/nacks are
+            # collected by the event pump, possibly several per frame
+            enable_async_confirms(self.channel, self._on_publish_confirm)
+            self.publish_seq = 0
+            # Anything the old connection never confirmed goes out again
+            self.outbox.extendleft(reversed(list(self.unconfirmed.values())))
+            self.unconfirmed.clear()
+            
+            # Resume consuming on the new channel after a reconnect
+            if self.consuming:
+                self._register_consumer()
+            
+            self.is_connected = True
+            self.logger.info(f"Successfully connected to RabbitMQ at {self.host}:{self.port}")
+            self.connection_status_changed.emit(True)
+            
+        except Exception as e:
+            self.logger.error(f"Failed to connect to RabbitMQ at {self.host}:{self.port}: {e}")
+            self.is_connected = False
+            # The queues may be gone (e.g. a consume on a deleted queue
+            # failed); declare them again on the next attempt
+            self.queues_declared = False
+            self.connection_status_changed.emit(False)
     
     def disconnect(self):
-        """Close RabbitMQ connection"""
-        with QMutexLocker(self.mutex):
-            self.consuming = False
-            try:
-                if self.connection and not self.connection.is_closed:
-                    self.connection.close()
-                self.is_connected = False
-                self.connection_status_changed.emit(False)
-                self.logger.info("Disconnected from RabbitMQ")
-            except Exception as e:
-                self.logger.error(f"Error disconnecting from RabbitMQ: {e}")
+        """Close RabbitMQ connection (on the worker thread)"""
+        self.disconnect_requested.emit()
+    
+    @pyqtSlot()
+    def _disconnect(self):
+        """Cancel the consumer and close the connection on the worker thread"""
+        self.consuming = False
+        try:
+            if self.consumer_tag and self.channel and self.channel.is_open:
+                self.channel.basic_cancel(self.consumer_tag)
+            self.consumer_tag = None
+            if self.connection and not self.connection.is_closed:
+                self.connection.close()
+            self.is_connected = False
+            self.connection_status_changed.emit(False)
+            self.logger.info("Disconnected from RabbitMQ")
+        except Exception as e:
+            self.logger.error(f"Error disconnecting from RabbitMQ: {e}")
     
     def send_message(self, queue_name, message):
-        """Send message to specified queue - thread safe"""
-        with QMutexLocker(self.mutex):
-            if not self.is_connected:
-                self.logger.warning("Cannot send message: Not connected to RabbitMQ")
-                return False
-                
+        """Queue a message for the worker thread to publish - thread safe"""
+        if not self.is_connected:
+            self.logger.warning("Cannot send message: Not connected to RabbitMQ")
+            return False
+        
+        # The id stays with the message through re-publishes, see class docstring
+        self.outbox.append((queue_name, message, secrets.token_hex(16)))
+        self.publish_requested.emit()
+        return True
+    
+    def _publish_outbox(self):
+        """Publish queued messages (worker thread)"""
+        while self.outbox:
+            entry = self.outbox.popleft()
+            queue_name, message, message_id = entry
             try:
                 self.channel.basic_publish(
                     exchange='',
                     routing_key=queue_name,
-                    body=json.dumps(message),
+                    body=orjson.dumps(message),
                     properties=pika.BasicProperties(
                         delivery_mode=2,
-                        content_type='application/json'
+                        content_type='application/json',
+                        message_id=message_id
                     )
                 )
-                self.logger.debug(f"Message sent to queue '{queue_name}': {message}")
-                return True
+                self.publish_seq += 1
+                self.unconfirmed[self.publish_seq] = entry
+                self.logger.debug("Message sent to queue '%s': %s", queue_name, message)
                 
             except Exception as e:
+                # Keep the message for the next connection
+                self.outbox.appendleft(entry)
                 self.logger.error(f"Failed to send message to queue '{queue_name}': {e}")
                 self.is_connected = False
                 self.connection_status_changed.emit(False)
-                return False
+                return
+    
+    def _on_publish_confirm(self, method_frame):
+        """Handle a (possibly multiple) Basic.Ack/Basic.Nack from the broker"""
+        confirm = method_frame.method
+        if confirm.multiple:
+            tags = [tag for tag in self.unconfirmed if tag <= confirm.delivery_tag]
+        else:
+            tags = [confirm.delivery_tag] if confirm.delivery_tag in self.unconfirmed else []
+        
+        nacked = isinstance(confirm, pika.spec.Basic.Nack)
+        for tag in tags:
+            entry = self.unconfirmed.pop(tag)
+            if nacked:
+                self.logger.warning(f"Message to queue '{entry[0]}' was nacked by the broker, re-publishing")
+                self.outbox.append(entry)
     
     def send_command(self, command_data):
         """Send command to greenhouse commands queue"""
         return self.send_message(self.command_queue, command_data)
     
     def start_consuming(self):
-        """Start consuming messages using non-blocking approach"""
-        if not self.is_connected:
-            return False
-            
+        """Start consuming messages; the broker pushes them to _on_message
+        
+        May be called before the connection is up: the consumer is then
+        registered as soon as it is.
+        """
+        self.consume_requested.emit()
+    
+    @pyqtSlot()
+    def _start_consuming(self):
         self.consuming = True
-        self.logger.info("Started message consumption")
-        return True
+        if self.is_connected and self.consumer_tag is None:
+            self._register_consumer()
+            self.logger.info("Started message consumption")
+    
+    def set_prefetch(self, count):
+        """Change the consumer prefetch, applying it to a live consumer"""
+        self.prefetch_requested.emit(count)
+    
+    @pyqtSlot(int)
+    def _set_prefetch(self, count):
+        self.prefetch = count
+        if not self.is_connected:
+            return
+        try:
+            self.channel.basic_qos(prefetch_count=count)
+            # Per-consumer QoS only covers consumers created after it
+            if self.consumer_tag is not None:
+                self.channel.basic_cancel(self.consumer_tag)
+                self._register_consumer()
+            self.logger.info(f"Consumer prefetch set to {count}")
+        except Exception as e:
+            self.logger.error(f"Failed to set consumer prefetch: {e}")
+    
+    def _register_consumer(self):
+        """Register the response queue consumer (worker thread)"""
+        self.consumer_tag = self.channel.basic_consume(
+            queue=self.response_queue,
+            on_message_callback=self._on_message,
+            auto_ack=False
+        )
     
+    def _on_message(self, channel, method_frame, properties, body):
+        """Decode a pushed response into the inbox; _deliver_inbox hands it on"""
+        try:
+            self.inbox.append(orjson.loads(body))
+            self.last_ack_tag = method_frame.delivery_tag
+        except Exception as e:
+            self.logger.error(f"Error processing message: {e}")
+            channel.basic_nack(method_frame.delivery_tag, requeue=False)
+    
+    @pyqtSlot()
     def _process_events(self):
-        """Process RabbitMQ events and check for new messages"""
-        if not self.is_connected or not self.consuming:
+        """Publish queued messages and dispatch frames the broker has already sent"""
+        if not self.is_connected:
             return
             
-        with QMutexLocker(self.mutex):
-            try:
-                # Check for messages with timeout=0 (non-blocking)
-                method_frame, properties, body = self.channel.basic_get(
-                    queue=self.response_queue,
-                    auto_ack=True
-                )
-                
-                if method_frame:
-                    # Message received
-                    try:
-                        message = json.loads(body.decode())
-                        self.message_received.emit(message)
-                        self.logger.debug("Message received and processed")
-                    except Exception as e:
-                        self.logger.error(f"Error processing message: {e}")
-                
-                # Process connection events
-                self.connection.process_data_events()
-                
-            except Exception as e:
-                self.logger.error(f"Error processing RabbitMQ events: {e}")
-                self.is_connected = False
-                self.connection_status_changed.emit(False)
+        self._publish_outbox()
+        if not self.is_connected:
+            return
+        
+        try:
+            # Deliveries to our consumer are handled in _on_message
+            self.connection.process_data_events(time_limit=0)
+            self._deliver_inbox()
+            
+        except Exception as e:
+            self.logger.error(f"Error processing RabbitMQ events: {e}")
+            self.is_connected = False
+            self.connection_status_changed.emit(False)
+    
+    def _deliver_inbox(self):
+        """Emit this pump's messages in one signal, then ack them in one frame"""
+        if self.inbox:
+            messages, self.inbox = self.inbox, []
+            self.messages_received.emit(messages)
+            self.logger.debug("Delivered %d message(s)", len(messages))
+        if self.last_ack_tag is not None:
+            self.channel.basic_ack(self.last_ack_tag, multiple=True)
+            self.last_ack_tag = None
+    
+    def shutdown(self):
+        """Disconnect and stop the worker thread (call from the GUI thread on exit)"""
+        # Blocking, so the connection is closed before the thread's loop exits
+        QMetaObject.invokeMethod(self, "_disconnect", Qt.BlockingQueuedConnection)
+        self.worker_thread.quit()
+        self.worker_thread.wait()
@@ -1,7 +1,13 @@
-from dataclasses import dataclass
+import sys
+from dataclasses import dataclass, field, replace
+from functools import wraps
 from typing import Dict, Any
 
-@dataclass
+from modules.compat import DATACLASS_SLOTS
+
+# Theme values are read-only: themes and their palettes are frozen (and hashable)
+
+@dataclass(frozen=True, **DATACLASS_SLOTS)
 class ColorPalette:
     """Modern color palette for the greenhouse application"""
     primary: str = "#2E7D32"  # Deep green
@@ -34,7 +40,7 @@ class ColorPalette:
     grey_800: str = "#424242"
     grey_900: str = "#212121"
 
-@dataclass
+@dataclass(frozen=True, **DATACLASS_SLOTS)
 class Typography:
     """Typography settings"""
     font_family: str = "Segoe UI, Roboto, Arial, sans-serif"
@@ -54,7 +60,7 @@ class Typography:
     medium: str = "500"
     bold: str = "600"
 
-@dataclass
+@dataclass(frozen=True, **DATACLASS_SLOTS)
 class Spacing:
     """Spacing system"""
     xs: str = "4px"
@@ -65,7 +71,7 @@ class Spacing:
     xxl: str = "20px"
     xxxl: str = "24px"
 
-@dataclass
+@dataclass(frozen=True, **DATACLASS_SLOTS)
 class BorderRadius:
     """Border radius values"""
     sm: str = "3px"
@@ -74,298 +80,496 @@ class BorderRadius:
     xl: str = "10px"
     round: str = "50%"
 
-@dataclass
+@dataclass(frozen=True, **DATACLASS_SLOTS)
 class GreenhouseTheme:
-    """Complete theme configuration for the greenhouse application"""
-    colors: ColorPalette
-    typography: Typography
-    spacing: Spacing
-    borderRadius: BorderRadius
+    """Complete theme configuration for the greenhouse application
+    
+    Share DEFAULT_THEME rather than constructing new ones; variations are new
+    themes, see with_override().
+    """
+    colors: ColorPalette = field(default_factory=ColorPalette)
+    typography: Typography = field(default_factory=Typography)
+    spacing: Spacing = field(default_factory=Spacing)
+    borderRadius: BorderRadius = field(default_factory=BorderRadius)
+    # Stylesheets built from this theme, shared by every generator over it
+    style_cache: Dict[tuple, str] = field(default_factory=dict, init=False, compare=False, repr=False)
+    
+    def with_override(self, **colors: str) -> "GreenhouseTheme":
+        """Copy of the theme with some colors replaced (and an empty cache)"""
+        return replace(self, colors=replace(self.colors, **colors))
+
+def compact(css: str) -> str:
+    """Drop a template's source indentation and surrounding blank lines
+    
+    Applied once at import, so Qt parses (and the cache holds) only the CSS.
+    """
+    return "\n".join(line.strip() for line in css.strip().splitlines())
+
+# Stylesheet templates, rendered with str.format_map against the theme:
+# {colors.primary}, {spacing.sm}, ... are resolved by the C formatter, and
+# literal CSS braces are doubled
+MAIN_WINDOW_TEMPLATE = compact("""
+QMainWindow {{
+    background-color: {colors.background};
+    color: {colors.text_primary};
+    font-family: {typography.font_family};
+    font-size: {typography.body};
+}}
+""")
+
+# One button template; variants only differ in these fields. Each field is
+# itself a template, filled against the theme before the button template
+BUTTON_TEMPLATE = compact("""
+QPushButton {{
+    background-color: {background};
+    color: {color};
+    border: {border};
+    border-radius: {borderRadius.md};
+    padding: {spacing.sm} {spacing.lg};
+    font-weight: {typography.medium};
+    font-size: {typography.body};
+    min-height: 20px;
+}}
+QPushButton:hover {{
+    {hover}
+}}
+QPushButton:pressed {{
+    {pressed}
+}}
+{extra}""")
+
+BUTTON_VARIANTS = {
+    "primary": {
+        "background": "{colors.primary}",
+        "color": "{colors.text_light}",
+        "border": "none",
+        "hover": "background-color: {colors.primary_light};",
+        "pressed": "background-color: {colors.primary_dark};",
+        "extra": compact("""QPushButton:disabled {{
+    background-color: {colors.grey_400};
+    color: {colors.grey_600};
+}}
+"""),
+    },
+    "secondary": {
+        "background": "{colors.secondary}",
+        "color": "{colors.text_light}",
+        "border": "none",
+        "hover": "background-color: {colors.secondary_light};",
+        "pressed": "background-color: {colors.secondary_dark};",
+        "extra": "",
+    },
+    "outline": {
+        "background": "transparent",
+        "color": "{colors.primary}",
+        "border": "1px solid {colors.primary}",
+        "hover": "background-color: {colors.primary};\ncolor: {colors.text_light};",
+        "pressed": "background-color: {colors.primary_dark};\nborder-color: {colors.primary_dark};",
+        "extra": "",
+    },
+    "default": {
+        "background": "{colors.surface}",
+        "color": "{colors.text_primary}",
+        "border": "1px solid {colors.grey_300}",
+        "hover": "background-color: {colors.grey_100};\nborder-color: {colors.grey_400};",
+        "pressed": "background-color: {colors.grey_200};",
+        "extra": "",
+    },
+}
+
+GROUP_BOX_TEMPLATE = compact("""
+QGroupBox {{
+    background-color: {colors.surface};
+    border: 1px solid {colors.grey_300};
+    border-radius: {borderRadius.lg};
+    margin-top: {spacing.xl};
+    padding-top: {spacing.md};
+    font-weight: {typography.medium};
+    color: {colors.text_primary};
+    font-size: {typography.h3};
+}}
+QGroupBox::title {{
+    subcontrol-origin: margin;
+    left: {spacing.lg};
+    padding: {spacing.xs} {spacing.lg};
+    background-color: {colors.primary};
+    color: {colors.text_light};
+    border-radius: {borderRadius.md};
+}}
+""")
+
+TEXT_EDIT_TEMPLATE = compact("""
+QTextEdit {{
+    background-color: {colors.surface};
+    border: 1px solid {colors.grey_300};
+    border-radius: {borderRadius.md};
+    padding: {spacing.sm};
+    font-family: {typography.font_family_mono};
+    font-size: {typography.caption};
+    color: {colors.text_primary};
+    selection-background-color: {colors.primary_light};
+}}
+QTextEdit:focus {{
+    border: 1px solid {colors.primary};
+}}
+""")
+
+LINE_EDIT_TEMPLATE = compact("""
+QLineEdit {{
+    background-color: {colors.surface};
+    border: 1px solid {colors.grey_300};
+    border-radius: {borderRadius.md};
+    padding: {spacing.sm} {spacing.md};
+    font-size: {typography.body};
+    color: {colors.text_primary};
+    min-height: 20px;
+}}
+QLineEdit:focus {{
+    border: 1px solid {colors.primary};
+}}
+""")
+
+LABEL_TEMPLATES = {
+    "title": compact("""
+QLabel {{
+    font-size: {typography.h1};
+    font-weight: {typography.bold};
+    color: {colors.text_primary};
+    padding: {spacing.sm} 0;
+}}
+"""),
+    "subtitle": compact("""
+QLabel {{
+    font-size: {typography.h2};
+    font-weight: {typography.medium};
+    color: {colors.text_primary};
+    padding: {spacing.xs} 0;
+}}
+"""),
+    "caption": compact("""
+QLabel {{
+    font-size: {typography.caption};
+    color: {colors.text_secondary};
+    padding: {spacing.xs} 0;
+}}
+"""),
+    "success": compact("""
+QLabel {{
+    font-size: {typography.body};
+    color: {colors.success};
+    font-weight: {typography.medium};
+}}
+"""),
+    "error": compact("""
+QLabel {{
+    font-size: {typography.body};
+    color: {colors.error};
+    font-weight: {typography.medium};
+}}
+"""),
+    "body": compact("""
+QLabel {{
+    font-size: {typography.body};
+    color: {colors.text_primary};
+    padding: {spacing.xs} 0;
+}}
+"""),
+}
+
+TAB_WIDGET_TEMPLATE = compact("""
+QTabWidget::pane {{
+    border: 1px solid {colors.grey_300};
+    border-radius: {borderRadius.lg};
+    background-color: {colors.surface};
+    margin-top: -1px;
+}}
+QTabWidget::tab-bar {{
+    alignment: center;
+}}
+QTabBar::tab {{
+    background-color: {colors.grey_200};
+    border: 1px solid {colors.grey_300};
+    border-bottom: none;
+    border-top-left-radius: {borderRadius.md};
+    border-top-right-radius: {borderRadius.md};
+    padding: {spacing.sm} {spacing.lg};
+    margin-right: {spacing.xs};
+    font-weight: {typography.medium};
+    color: {colors.text_secondary};
+    min-width: 80px;
+}}
+QTabBar::tab:selected {{
+    background-color: {colors.surface};
+    color: {colors.primary};
+    border-color: {colors.grey_300};
+    border-bottom: 1px solid {colors.surface};
+}}
+QTabBar::tab:hover:!selected {{
+    background-color: {colors.grey_100};
+    color: {colors.text_primary};
+}}
+""")
+
+CHECKBOX_TEMPLATE = compact("""
+QCheckBox {{
+    spacing: {spacing.sm};
+    color: {colors.text_primary};
+    font-size: {typography.body};
+}}
+QCheckBox::indicator {{
+    width: 16px;
+    height: 16px;
+    border: 1px solid {colors.grey_400};
+    border-radius: {borderRadius.sm};
+    background-color: {colors.surface};
+}}
+QCheckBox::indicator:checked {{
+    background-color: {colors.primary};
+    border-color: {colors.primary};
+}}
+QCheckBox::indicator:checked:hover {{
+    background-color: {colors.primary_light};
+    border-color: {colors.primary_light};
+}}
+QCheckBox::indicator:hover {{
+    border-color: {colors.primary};
+}}
+""")
+
+# Badge-like labels carry bare declarations for the label itself
+SESSION_LABEL_TEMPLATE = compact("""
+font-family: {typography.font_family_mono};
+color: {colors.primary};
+background-color: {colors.grey_100};
+padding: 2px 6px;
+border-radius: {borderRadius.sm};
+font-weight: {typography.medium};
+border: 1px solid {colors.grey_300};
+""")
+
+PATH_LABEL_TEMPLATE = compact("""
+font-family: {typography.font_family_mono};
+background-color: {colors.grey_100};
+padding: 4px 8px;
+border-radius: {borderRadius.md};
+border: 1px solid {colors.grey_300};
+color: {colors.text_primary};
+font-weight: {typography.medium};
+""")
+
+CONNECTION_STATUS_TEMPLATE = compact("""
+color: {color};
+font-weight: {typography.medium};
+background-color: {colors.grey_100};
+padding: 2px 6px;
+border-radius: {borderRadius.sm};
+border: 1px solid {colors.grey_300};
+{accent}
+""")
+
+STATUS_LABEL_TEMPLATE = compact("""
+color: {color};
+font-weight: {typography.medium};
+background-color: {colors.grey_50};
+padding: {padding};
+border-radius: {borderRadius.md};
+border-left: {accent} solid {color};
+""")
+
+# Per-variant fields for the badge templates, filled like BUTTON_VARIANTS
+CONNECTION_STATUS_VARIANTS = {
+    "connecting": {"color": "{colors.warning}", "accent": ""},
+    "connected": {"color": "{colors.success}", "accent": "border-left: 2px solid {colors.success};"},
+    "disconnected": {"color": "{colors.error}", "accent": "border-left: 2px solid {colors.error};"},
+}
+
+STATUS_LABEL_VARIANTS = {
+    "ready": {"color": "{colors.success}", "padding": "4px 8px", "accent": "2px"},
+    "success": {"color": "{colors.success}", "padding": "6px 12px", "accent": "3px"},
+    "error": {"color": "{colors.error}", "padding": "6px 12px", "accent": "3px"},
+}
+
+# Every stylesheet the generator builds, as (kind, variants): kind names the
+# generate_<kind>_style method, an empty variants tuple means it takes none
+STYLE_VARIANTS = (
+    ("main_window", ()),
+    ("button", tuple(BUTTON_VARIANTS)),
+    ("group_box", ()),
+    ("text_edit", ()),
+    ("line_edit", ()),
+    ("label", tuple(LABEL_TEMPLATES)),
+    ("tab_widget", ()),
+    ("checkbox", ()),
+    ("session_label", ()),
+    ("path_label", ()),
+    ("connection_status", tuple(CONNECTION_STATUS_VARIANTS)),
+    ("status_label", tuple(STATUS_LABEL_VARIANTS)),
+    ("global", ()),
+)
+
+# Style role -> (generator kind, arguments), e.g. 'button:primary' -> ("button", ("primary",))
+STYLE_ROLES = {
+    **{kind: (kind, ()) for kind, variants in STYLE_VARIANTS if not variants},
+    **{f"{kind}:{variant}": (kind, (variant,)) for kind, variants in STYLE_VARIANTS for variant in variants},
+}
+
+# Type-level sheets that go into the one window-wide stylesheet and cascade
+# to every matching child; buttons and labels keep per-widget sheets since
+# their variant depends on the widget
+GLOBAL_STYLE_KINDS = ("main_window", "group_box", "text_edit", "line_edit", "tab_widget", "checkbox")
+
+def memoized_style(method):
+    """Cache a generator method's stylesheet per theme and argument tuple
     
-    def __init__(self):
-        self.colors = ColorPalette()
-        self.typography = Typography()
-        self.spacing = Spacing()
-        self.borderRadius = BorderRadius()
+    Cached sheets are interned, so equal sheets, e.g. from two themes with
+    the same values, are one object and identity checks before
+    setStyleSheet hold across them.
+    """
+    @wraps(method)
+    def wrapper(self, *args):
+        key = (method.__name__,) + args
+        try:
+            return self._style_cache[key]
+        except KeyError:
+            style = self._style_cache[key] = sys.intern(method(self, *args))
+            return style
+    return wrapper
+
+class StyleTable(dict):
+    """Stylesheets keyed by style role, each built on its first lookup
+    
+    A window only looks up the roles it has widgets for, so sheets for the
+    rest are never rendered.
+    """
+    
+    def __init__(self, generator: "StyleSheetGenerator"):
+        super().__init__()
+        self.generator = generator
+    
+    def __missing__(self, role: str) -> str:
+        try:
+            kind, args = STYLE_ROLES[role]
+        except KeyError:
+            raise KeyError(role) from None
+        style = self[role] = getattr(self.generator, f"generate_{kind}_style")(*args)
+        return style
 
 class StyleSheetGenerator:
-    """Generates PyQt5-compatible CSS stylesheets"""
+    """Generates PyQt5-compatible CSS stylesheets
+    
+    Stylesheets are pure functions of the theme, so each is built once, on
+    first use, and then served from the theme's cache; generators over the
+    same theme share it.
+    """
     
     def __init__(self, theme: GreenhouseTheme):
         self.theme = theme
+        self._style_cache = theme.style_cache
         self.colors = theme.colors
         self.typography = theme.typography
         self.spacing = theme.spacing
         self.borderRadius = theme.borderRadius
+        # Template fields by name, resolved with attribute lookups in C
+        self.tokens: Dict[str, Any] = {
+            "colors": self.colors,
+            "typography": self.typography,
+            "spacing": self.spacing,
+            "borderRadius": self.borderRadius,
+        }
+        # Stylesheets keyed by style role, built on demand (see StyleTable)
+        self.styles = StyleTable(self)
     
+    def render(self, template: str, **fields: str) -> str:
+        """Fill a template from the theme plus any extra fields"""
+        if fields:
+            return template.format_map({**self.tokens, **fields})
+        return template.format_map(self.tokens)
+    
+    def render_variant(self, template: str, variants: Dict[str, Dict[str, str]],
+                       variant: str, default: str) -> str:
+        """Fill a variant's field templates, then the shared template with them"""
+        fields = variants.get(variant, variants[default])
+        return self.render(template, **{name: self.render(value) for name, value in fields.items()})
+    
+    @memoized_style
     def generate_main_window_style(self) -> str:
         """Generate style for the main window"""
-        return f"""
-            QMainWindow {{
-                background-color: {self.colors.background};
-                color: {self.colors.text_primary};
-                font-family: {self.typography.font_family};
-                font-size: {self.typography.body};
-            }}
-        """
+        return self.render(MAIN_WINDOW_TEMPLATE)
+    
+    @memoized_style
+    def generate_global_style(self) -> str:
+        """Generate the window-wide stylesheet: every type-level sheet in one"""
+        return "\n".join(getattr(self, f"generate_{kind}_style")() for kind in GLOBAL_STYLE_KINDS)
     
+    @memoized_style
     def generate_button_style(self, variant: str = "primary") -> str:
         """Generate button styles based on variant"""
-        if variant == "primary":
-            return f"""
-                QPushButton {{
-                    background-color: {self.colors.primary};
-                    color: {self.colors.text_light};
-                    border: none;
-                    border-radius: {self.borderRadius.md};
-                    padding: {self.spacing.sm} {self.spacing.lg};
-                    font-weight: {self.typography.medium};
-                    font-size: {self.typography.body};
-                    min-height: 20px;
-                }}
-                QPushButton:hover {{
-                    background-color: {self.colors.primary_light};
-                }}
-                QPushButton:pressed {{
-                    background-color: {self.colors.primary_dark};
-                }}
-                QPushButton:disabled {{
-                    background-color: {self.colors.grey_400};
-                    color: {self.colors.grey_600};
-                }}
-            """
-        elif variant == "secondary":
-            return f"""
-                QPushButton {{
-                    background-color: {self.colors.secondary};
-                    color: {self.colors.text_light};
-                    border: none;
-                    border-radius: {self.borderRadius.md};
-                    padding: {self.spacing.sm} {self.spacing.lg};
-                    font-weight: {self.typography.medium};
-                    font-size: {self.typography.body};
-                    min-height: 20px;
-                }}
-                QPushButton:hover {{
-                    background-color: {self.colors.secondary_light};
-                }}
-                QPushButton:pressed {{
-                    background-color: {self.colors.secondary_dark};
-                }}
-            """
-        elif variant == "outline":
-            return f"""
-                QPushButton {{
-                    background-color: transparent;
-                    color: {self.colors.primary};
-                    border: 1px solid {self.colors.primary};
-                    border-radius: {self.borderRadius.md};
-                    padding: {self.spacing.sm} {self.spacing.lg};
-                    font-weight: {self.typography.medium};
-                    font-size: {self.typography.body};
-                    min-height: 20px;
-                }}
-                QPushButton:hover {{
-                    background-color: {self.colors.primary};
-                    color: {self.colors.text_light};
-                }}
-                QPushButton:pressed {{
-                    background-color: {self.colors.primary_dark};
-                    border-color: {self.colors.primary_dark};
-                }}
-            """
-        else:  # default
-            return f"""
-                QPushButton {{
-                    background-color: {self.colors.surface};
-                    color: {self.colors.text_primary};
-                    border: 1px solid {self.colors.grey_300};
-                    border-radius: {self.borderRadius.md};
-                    padding: {self.spacing.sm} {self.spacing.lg};
-                    font-weight: {self.typography.medium};
-                    font-size: {self.typography.body};
-                    min-height: 20px;
-                }}
-                QPushButton:hover {{
-                    background-color: {self.colors.grey_100};
-                    border-color: {self.colors.grey_400};
-                }}
-                QPushButton:pressed {{
-                    background-color: {self.colors.grey_200};
-                }}
-            """
+        return self.render_variant(BUTTON_TEMPLATE, BUTTON_VARIANTS, variant, "default")
     
+    @memoized_style
     def generate_group_box_style(self) -> str:
         """Generate style for group boxes"""
-        return f"""
-            QGroupBox {{
-                background-color: {self.colors.surface};
-                border: 1px solid {self.colors.grey_300};
-                border-radius: {self.borderRadius.lg};
-                margin-top: {self.spacing.xl};
-                padding-top: {self.spacing.md};
-                font-weight: {self.typography.medium};
-                color: {self.colors.text_primary};
-                font-size: {self.typography.h3};
-            }}
-            QGroupBox::title {{
-                subcontrol-origin: margin;
-                left: {self.spacing.lg};
-                padding: {self.spacing.xs} {self.spacing.lg};
-                background-color: {self.colors.primary};
-                color: {self.colors.text_light};
-                border-radius: {self.borderRadius.md};
-            }}
-        """
+        return self.render(GROUP_BOX_TEMPLATE)
     
+    @memoized_style
     def generate_text_edit_style(self) -> str:
         """Generate style for text edit widgets"""
-        return f"""
-            QTextEdit {{
-                background-color: {self.colors.surface};
-                border: 1px solid {self.colors.grey_300};
-                border-radius: {self.borderRadius.md};
-                padding: {self.spacing.sm};
-                font-family: {self.typography.font_family_mono};
-                font-size: {self.typography.caption};
-                color: {self.colors.text_primary};
-                selection-background-color: {self.colors.primary_light};
-            }}
-            QTextEdit:focus {{
-                border: 1px solid {self.colors.primary};
-            }}
-        """
+        return self.render(TEXT_EDIT_TEMPLATE)
     
+    @memoized_style
     def generate_line_edit_style(self) -> str:
         """Generate style for line edit widgets"""
-        return f"""
-            QLineEdit {{
-                background-color: {self.colors.surface};
-                border: 1px solid {self.colors.grey_300};
-                border-radius: {self.borderRadius.md};
-                padding: {self.spacing.sm} {self.spacing.md};
-                font-size: {self.typography.body};
-                color: {self.colors.text_primary};
-                min-height: 20px;
-            }}
-            QLineEdit:focus {{
-                border: 1px solid {self.colors.primary};
-            }}
-        """
+        return self.render(LINE_EDIT_TEMPLATE)
     
+    @memoized_style
     def generate_label_style(self, variant: str = "body") -> str:
         """Generate label styles based on variant"""
-        if variant == "title":
-            return f"""
-                QLabel {{
-                    font-size: {self.typography.h1};
-                    font-weight: {self.typography.bold};
-                    color: {self.colors.text_primary};
-                    padding: {self.spacing.sm} 0;
-                }}
-            """
-        elif variant == "subtitle":
-            return f"""
-                QLabel {{
-                    font-size: {self.typography.h2};
-                    font-weight: {self.typography.medium};
-                    color: {self.colors.text_primary};
-                    padding: {self.spacing.xs} 0;
-                }}
-            """
-        elif variant == "caption":
-            return f"""
-                QLabel {{
-                    font-size: {self.typography.caption};
-                    color: {self.colors.text_secondary};
-                    padding: {self.spacing.xs} 0;
-                }}
-            """
-        elif variant == "success":
-            return f"""
-                QLabel {{
-                    font-size: {self.typography.body};
-                    color: {self.colors.success};
-                    font-weight: {self.typography.medium};
-                }}
-            """
-        elif variant == "error":
-            return f"""
-                QLabel {{
-                    font-size: {self.typography.body};
-                    color: {self.colors.error};
-                    font-weight: {self.typography.medium};
-                }}
-            """
-        else:  # body
-            return f"""
-                QLabel {{
-                    font-size: {self.typography.body};
-                    color: {self.colors.text_primary};
-                    padding: {self.spacing.xs} 0;
-                }}
-            """
+        return self.render(LABEL_TEMPLATES.get(variant, LABEL_TEMPLATES["body"]))
     
+    @memoized_style
     def generate_tab_widget_style(self) -> str:
         """Generate style for tab widgets"""
-        return f"""
-            QTabWidget::pane {{
-                border: 1px solid {self.colors.grey_300};
-                border-radius: {self.borderRadius.lg};
-                background-color: {self.colors.surface};
-                margin-top: -1px;
-            }}
-            QTabWidget::tab-bar {{
-                alignment: center;
-            }}
-            QTabBar::tab {{
-                background-color: {self.colors.grey_200};
-                border: 1px solid {self.colors.grey_300};
-                border-bottom: none;
-                border-top-left-radius: {self.borderRadius.md};
-                border-top-right-radius: {self.borderRadius.md};
-                padding: {self.spacing.sm} {self.spacing.lg};
-                margin-right: {self.spacing.xs};
-                font-weight: {self.typography.medium};
-                color: {self.colors.text_secondary};
-                min-width: 80px;
-            }}
-            QTabBar::tab:selected {{
-                background-color: {self.colors.surface};
-                color: {self.colors.primary};
-                border-color: {self.colors.grey_300};
-                border-bottom: 1px solid {self.colors.surface};
-            }}
-            QTabBar::tab:hover:!selected {{
-                background-color: {self.colors.grey_100};
-                color: {self.colors.text_primary};
-            }}
-        """
+        return self.render(TAB_WIDGET_TEMPLATE)
     
+    @memoized_style
     def generate_checkbox_style(self) -> str:
         """Generate style for checkboxes"""
-        return f"""
-            QCheckBox {{
-                spacing: {self.spacing.sm};
-                color: {self.colors.text_primary};
-                font-size: {self.typography.body};
-            }}
-            QCheckBox::indicator {{
-                width: 16px;
-                height: 16px;
-                border: 1px solid {self.colors.grey_400};
-                border-radius: {self.borderRadius.sm};
-                background-color: {self.colors.surface};
-            }}
-            QCheckBox::indicator:checked {{
-                background-color: {self.colors.primary};
-                border-color: {self.colors.primary};
-            }}
-            QCheckBox::indicator:checked:hover {{
-                background-color: {self.colors.primary_light};
-                border-color: {self.colors.primary_light};
-            }}
-            QCheckBox::indicator:hover {{
-                border-color: {self.colors.primary};
-            }}
-        """
\ No newline at end of file
+        return self.render(CHECKBOX_TEMPLATE)
+    
+    @memoized_style
+    def generate_session_label_style(self) -> str:
+        """Generate style for the session id badge"""
+        return self.render(SESSION_LABEL_TEMPLATE)
+    
+    @memoized_style
+    def generate_path_label_style(self) -> str:
+        """Generate style for the current path display"""
+        return self.render(PATH_LABEL_TEMPLATE)
+    
+    @memoized_style
+    def generate_connection_status_style(self, state: str = "connecting") -> str:
+        """Generate connection badge styles: connecting, connected or disconnected"""
+        return self.render_variant(CONNECTION_STATUS_TEMPLATE, CONNECTION_STATUS_VARIANTS, state, "connecting")
+    
+    @memoized_style
+    def generate_status_label_style(self, variant: str = "ready") -> str:
+        """Generate status line styles: ready (idle), success or error"""
+        return self.render_variant(STATUS_LABEL_TEMPLATE, STATUS_LABEL_VARIANTS, variant, "ready")
+
+def apply_style(widget, style: str) -> bool:
+    """setStyleSheet unless this exact (cached, interned) sheet is already applied
+    
+    Skips Qt's stylesheet reparse and repolish when re-applying a theme.
+    Returns whether the sheet was applied.
+    """
+    if getattr(widget, "_applied_style", None) is style:
+        return False
+    widget.setStyleSheet(style)
+    widget._applied_style = style
+    return True
+
+# The stock theme and the shared generator over it, with each stylesheet
+# built once, when a window first asks for it. Prefer DEFAULT_GENERATOR to
+# constructing another generator for the stock look
+DEFAULT_THEME = GreenhouseTheme()
+DEFAULT_GENERATOR = StyleSheetGenerator(DEFAULT_THEME)